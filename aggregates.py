@@ -0,0 +1,129 @@
+# Incremental aggregate store
+# For every group we keep count, sum, min, max and M2 (the sum of squared
+# differences from the mean) of each value column. Those numbers can be combined
+# from any two batches, so a new batch of passengers only costs O(batch), and
+# stores built on different machines can be merged.
+# Mean and standard deviation come straight out of them when asked for.
+#
+# M2 plays the role of a sum of squares, but merging it with Chan's formula
+#   M2 = M2_a + M2_b + (mean_b - mean_a)^2 * n_a * n_b / n
+# avoids the cancellation of sum(x^2) - n * mean^2 on values like Fare.
+import numpy as np
+import pandas as pd
+
+from streaming import add_titanic_features
+
+STATS = ['count', 'sum', 'm2', 'min', 'max']
+
+# What day4_titanic_analysis.py reports (None = the whole dataset)
+TITANIC_GROUPINGS = {
+    'All': None,
+    'Sex': 'Sex',
+    'Pclass': 'Pclass',
+    'AgeGroup': 'AgeGroup',
+    'FamilySize': 'FamilySize',
+    'Embarked': 'Embarked',
+    'Pclass_Sex': ['Pclass', 'Sex'],
+}
+TITANIC_VALUES = ['Survived', 'Age', 'Fare']
+
+
+def batch_stats(batch, keys, values):
+    # The statistics per group for one batch, with one groupby
+    numbers = batch[values].astype('float64')
+    if keys is None:
+        groups = pd.Series('All', index=batch.index, name='group')
+    elif isinstance(keys, str):
+        groups = batch[keys]
+    else:
+        groups = [batch[key] for key in keys]
+
+    stats = numbers.groupby(groups, observed=True).agg(['count', 'sum', 'var', 'min', 'max'])
+    for value in values:
+        # var is M2 / (count - 1); a single value has no spread
+        m2 = stats[(value, 'var')] * (stats[(value, 'count')] - 1)
+        stats[(value, 'm2')] = m2.fillna(0)
+    # Always the same column order: value by value, STATS within each
+    return stats.reindex(columns=pd.MultiIndex.from_product([values, STATS]))
+
+
+def combine_stats(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    index = left.index.union(right.index)
+    columns = left.columns
+    n_values = len(columns) // len(STATS)
+
+    # groups x values x STATS arrays, so every value column is combined at once
+    a = left.reindex(index).to_numpy().reshape(len(index), n_values, len(STATS))
+    b = right.reindex(index).to_numpy().reshape(len(index), n_values, len(STATS))
+    n_a, sum_a, m2_a = (np.nan_to_num(a[:, :, i]) for i in range(3))
+    n_b, sum_b, m2_b = (np.nan_to_num(b[:, :, i]) for i in range(3))
+
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = sum_b / n_b - sum_a / n_a
+        shift = np.where((n_a > 0) & (n_b > 0), delta ** 2 * n_a * n_b / n, 0.0)
+
+    combined = np.stack([
+        n,
+        sum_a + sum_b,
+        m2_a + m2_b + shift,
+        np.fmin(a[:, :, 3], b[:, :, 3]),
+        np.fmax(a[:, :, 4], b[:, :, 4]),
+    ], axis=2)
+    return pd.DataFrame(combined.reshape(len(index), -1), index=index, columns=columns)
+
+
+class AggregateStore:
+
+    def __init__(self, groupings=None, values=None):
+        self.groupings = TITANIC_GROUPINGS if groupings is None else groupings
+        self.values = TITANIC_VALUES if values is None else values
+        self.stats = {name: None for name in self.groupings}
+        self.rows = 0
+
+    def update(self, batch):
+        for name, keys in self.groupings.items():
+            self.stats[name] = combine_stats(self.stats[name],
+                                             batch_stats(batch, keys, self.values))
+        self.rows += len(batch)
+        return self
+
+    def merge(self, other):
+        # Fold in a store built somewhere else (another worker, another day)
+        for name in self.groupings:
+            self.stats[name] = combine_stats(self.stats[name], other.stats[name])
+        self.rows += other.rows
+        return self
+
+    def table(self, grouping, value):
+        # count / sum / mean / std / min / max of one value per group
+        stats = self.stats[grouping][value]
+        count = stats['count']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = stats['sum'] / count
+            variance = (stats['m2'] / (count - 1)).where(count > 1)
+        table = pd.DataFrame({
+            'count': count.astype('int64'),
+            'sum': stats['sum'],
+            'mean': mean,
+            'std': np.sqrt(variance),
+            'min': stats['min'],
+            'max': stats['max'],
+        })
+        return table.sort_index()
+
+    def overall(self, value):
+        # One row of statistics for the whole dataset
+        return self.table('All', value).iloc[0]
+
+
+def titanic_store(batches):
+    # Build a store from an iterable of raw train.csv-style batches
+    store = AggregateStore()
+    for batch in batches:
+        store.update(add_titanic_features(batch))
+    return store
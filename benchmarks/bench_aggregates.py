@@ -0,0 +1,51 @@
+# Benchmark: incremental aggregate store vs full recomputation
+# (tests/test_aggregates.py checks that merged stores give the same numbers)
+# python -m benchmarks.bench_aggregates --rows 1e6 --batch 10000
+import argparse
+
+import numpy as np
+
+from aggregates import AggregateStore, TITANIC_GROUPINGS, TITANIC_VALUES, titanic_store
+from benchmarks.common import make_passengers, parse_rows, timed
+from streaming import add_titanic_features
+
+
+def full_table(df, keys, value):
+    # The from-scratch answer the store has to match
+    grouped = df[value].astype('float64').groupby(
+        [df[key] for key in keys] if isinstance(keys, list) else
+        (df[keys] if keys else np.zeros(len(df))), observed=True)
+    return grouped.agg(['count', 'sum', 'mean', 'std', 'min', 'max'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='incremental aggregates vs recompute')
+    parser.add_argument('--rows', default='1e6')
+    parser.add_argument('--batch', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=4, help='stores to build and merge')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = add_titanic_features(make_passengers(n_rows))
+        batches = [df.iloc[start:start + args.batch].copy()
+                   for start in range(0, n_rows, args.batch)]
+        print(f"\n=== {n_rows:,} rows in {len(batches)} batches of {args.batch:,} ===")
+
+        store = AggregateStore().update(batches[0])
+        update_time, _ = timed(store.update, batches[1], repeat=1)
+        full_time, _ = timed(lambda: [full_table(df, keys, value)
+                                      for keys in TITANIC_GROUPINGS.values()
+                                      for value in TITANIC_VALUES])
+        query_time, _ = timed(store.table, 'Pclass_Sex', 'Fare', repeat=5)
+        print(f"fold in one batch: {update_time * 1000:.1f} ms, "
+              f"recompute everything: {full_time * 1000:.1f} ms, query: {query_time * 1000:.2f} ms")
+
+        # One store per worker over interleaved batches, then merged
+        stores = [titanic_store(batches[worker::args.workers]) for worker in range(args.workers)]
+        merged = stores[0]
+        merge_time, _ = timed(lambda: [merged.merge(other) for other in stores[1:]])
+        print(f"merge {args.workers} stores: {merge_time * 1000:.1f} ms ({merged.rows:,} rows)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Benchmark: exact counting vs the fixed-memory sketches (Count-Min, Bloom filter)
+# Reports how far the approximate answers are from the exact ones, and whether
+# merging per-worker sketches gives the same answer as one sketch over everything
+# (tests/test_approx_counting.py asserts those guarantees).
+# python -m benchmarks.bench_approx_counting --words 1e6,1e7 --epsilon 0.0001
+import argparse
+import os
+import tempfile
+from collections import Counter
+
+import numpy as np
+
+from benchmarks.bench_words import write_corpus
+from benchmarks.common import parse_rows, timed
+from find_duplicates import find_duplicates, find_duplicates_approx
+from sketches import BloomFilter, CountMinSketch
+from word_counter import approx_count_words_in_file, count_words_in_file, top_words
+
+
+def zipf_ids(n_items, seed=0):
+    # High-cardinality ids: a few very common, most seen once or twice
+    rng = np.random.default_rng(seed)
+    return rng.zipf(1.3, n_items)
+
+
+def count_min_report(items, epsilon, delta, top, parts=4):
+    exact_time, exact = timed(Counter, items.tolist())
+    sketch_time, sketch = timed(lambda: CountMinSketch(epsilon, delta, top).update(items))
+
+    keys = np.array(list(exact))
+    true_counts = np.array([exact[key] for key in keys])
+    estimates = sketch.estimate(keys)
+    errors = estimates - true_counts
+    bound = epsilon * len(items)
+    print(f"Counter: {exact_time:.2f}s, {len(exact):,} keys | "
+          f"Count-Min: {sketch_time:.2f}s, {sketch.table.nbytes / 1e6:.1f} MB table")
+    print(f"  never under: {bool((errors >= 0).all())}, mean over: {errors.mean():.2f}, "
+          f"max over: {errors.max()}, within eps*N={bound:.0f}: {(errors <= bound).mean():.2%}")
+
+    expected_top = [key for key, _ in top_words(exact, 10)]
+    found_top = [key for key, _ in sketch.heavy_hitters(10)]
+    print(f"  top 10 recall: {len(set(expected_top) & set(found_top)) / 10:.0%}")
+
+    merged = CountMinSketch(epsilon, delta, top)
+    for part in np.array_split(items, parts):
+        merged.merge(CountMinSketch(epsilon, delta, top).update(part))
+    print(f"  {parts} merged sketches equal one sketch: {np.array_equal(merged.table, sketch.table)}")
+
+
+def bloom_report(items, error_rate):
+    exact_time, expected = timed(find_duplicates, items.tolist())
+    approx_time, found = timed(find_duplicates_approx, items, len(items), error_rate)
+    extra = set(found) - set(expected)
+    missed = set(expected) - set(found)
+    distinct = len(np.unique(items))
+    print(f"dict: {exact_time:.2f}s | Bloom: {approx_time:.2f}s, "
+          f"{BloomFilter(len(items), error_rate).bits.nbytes / 1e6:.1f} MB bits")
+    print(f"  missed duplicates: {len(missed)}, false duplicates: {len(extra)} "
+          f"({len(extra) / max(distinct - len(expected), 1):.3%} of unique items, target {error_rate:.3%})")
+
+    halves = np.array_split(items, 2)
+    first = BloomFilter(len(items), error_rate)
+    first.add(halves[0])
+    second = BloomFilter(len(items), error_rate)
+    second.add(halves[1])
+    whole = BloomFilter(len(items), error_rate)
+    whole.add(items)
+    print(f"  merged filters equal one filter: {np.array_equal(first.merge(second).bits, whole.bits)}")
+
+
+def word_report(megabytes, epsilon, top):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'corpus.txt')
+        write_corpus(path, megabytes)
+        exact_time, exact = timed(count_words_in_file, path, 1)
+        approx_time, sketch = timed(approx_count_words_in_file, path, epsilon, top=top, workers=1,
+                                    block_size=int(4e6))
+    expected = [word for word, _ in top_words(exact, 10)]
+    found = [word for word, _ in sketch.heavy_hitters(10)]
+    errors = sketch.estimate(expected) - np.array([exact[word] for word in expected])
+    print(f"{megabytes:.0f} MB text: exact {exact_time:.2f}s, approx {approx_time:.2f}s, "
+          f"top 10 recall {len(set(expected) & set(found)) / 10:.0%}, "
+          f"max over on top 10: {errors.max()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='approximate counting error and speed')
+    parser.add_argument('--words', default='1e6,1e7')
+    parser.add_argument('--epsilon', type=float, default=0.0001)
+    parser.add_argument('--delta', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--top', type=int, default=100)
+    parser.add_argument('--mb', type=float, default=50)
+    args = parser.parse_args()
+
+    for n_items in parse_rows(args.words):
+        items = zipf_ids(n_items)
+        print(f"=== {n_items:,} items ===")
+        count_min_report(items, args.epsilon, args.delta, args.top)
+        bloom_report(items, args.error_rate)
+    word_report(args.mb, args.epsilon, args.top)
+
+
+if __name__ == '__main__':
+    main()
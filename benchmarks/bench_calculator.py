@@ -0,0 +1,59 @@
+# Benchmark: calculator functions called per row in a Python loop vs on whole columns
+# Derived metric: fare per relative aboard, Fare / (SibSp + Parch), which divides by zero
+# for everyone travelling alone.
+# python -m benchmarks.bench_calculator --rows 1e6,1e7
+import argparse
+
+import numpy as np
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from calculator import add, divide
+
+
+def loop_metric(fares, sibsp, parch):
+    results = []
+    for fare, siblings, parents in zip(fares, sibsp, parch):
+        result = divide(fare, add(siblings, parents))
+        results.append(float('nan') if isinstance(result, str) else result)
+    return np.array(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='calculator: scalar loop vs arrays')
+    parser.add_argument('--rows', default='1e6,1e7')
+    parser.add_argument('--loop-limit', type=float, default=1e6,
+                        help='skip the Python loop above this many rows')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = make_passengers(n_rows)
+        fares = df['Fare'].to_numpy()
+        sibsp = df['SibSp'].to_numpy()
+        parch = df['Parch'].to_numpy()
+        print(f"=== {n_rows:,} rows ===")
+
+        array_time, fast = timed(lambda: divide(fares, add(sibsp, parch), 'nan'), repeat=3)
+        print(f"arrays: {array_time * 1000:.1f} ms")
+
+        relatives = np.empty(n_rows, dtype=np.int64)
+        out = np.empty(n_rows)
+
+        def into_buffers():
+            return divide(fares, add(sibsp, parch, out=relatives), 'nan', out=out)
+
+        out_time, _ = timed(into_buffers, repeat=3)
+        print(f"arrays with out=: {out_time * 1000:.1f} ms, same: {np.array_equal(out, fast, equal_nan=True)}")
+
+        series_time, from_series = timed(lambda: divide(df['Fare'], add(df['SibSp'], df['Parch']), 'nan'),
+                                         repeat=3)
+        print(f"Series: {series_time * 1000:.1f} ms, "
+              f"same: {np.array_equal(from_series.to_numpy(), fast, equal_nan=True)}")
+
+        if n_rows <= args.loop_limit:
+            loop_time, slow = timed(loop_metric, fares, sibsp, parch)
+            print(f"Python loop: {loop_time * 1000:.1f} ms ({loop_time / array_time:.0f}x slower), "
+                  f"same: {np.array_equal(slow, fast, equal_nan=True)}")
+
+
+if __name__ == '__main__':
+    main()
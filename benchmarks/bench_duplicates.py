@@ -0,0 +1,59 @@
+# Benchmark: find_duplicates (dict) vs the NumPy, chunked and DataFrame row-key paths
+# python -m benchmarks.bench_duplicates --rows 1e6,1e7,1e8 --chunk 1e6
+import argparse
+
+import numpy as np
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from find_duplicates import (find_duplicate_rows, find_duplicates, find_duplicates_array,
+                             find_duplicates_chunked, row_keys)
+
+
+def make_ids(n_items, seed=0):
+    # Ids drawn from a range the size of the data: about a third of them repeat
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n_items, n_items)
+
+
+def chunks_of(values, chunk_size):
+    return (values[start:start + chunk_size] for start in range(0, len(values), chunk_size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='duplicate detection throughput')
+    parser.add_argument('--rows', default='1e6,1e7')
+    parser.add_argument('--chunk', default='1e6', help='chunk size for the streaming path')
+    parser.add_argument('--dict-limit', type=float, default=1e7,
+                        help='skip the pure-Python baseline above this many items')
+    args = parser.parse_args()
+    chunk_size = parse_rows(args.chunk)[0]
+
+    for n_items in parse_rows(args.rows):
+        ids = make_ids(n_items)
+        print(f"=== {n_items:,} ids ===")
+        array_time, fast = timed(find_duplicates_array, ids)
+        print(f"find_duplicates_array: {array_time:.2f}s, {len(fast):,} duplicates")
+        chunked_time, streamed = timed(lambda: find_duplicates_chunked(chunks_of(ids, chunk_size)))
+        print(f"find_duplicates_chunked ({chunk_size:,} per chunk): {chunked_time:.2f}s, "
+              f"same as array path: {np.array_equal(streamed, fast)}")
+        if n_items <= args.dict_limit:
+            dict_time, expected = timed(find_duplicates, ids.tolist())
+            print(f"find_duplicates (dict): {dict_time:.2f}s, "
+                  f"same values and order: {fast.tolist() == expected}")
+
+    # Multi-column keys on manifest-like data (Ticket + Pclass)
+    rows = min(parse_rows(args.rows))
+    df = make_passengers(rows)
+    keys = ['Ticket', 'Pclass']
+    rows_time, duplicated = timed(find_duplicate_rows, df, keys)
+    hash_time, hashed = timed(lambda: find_duplicates_chunked(chunks_of(row_keys(df, keys), chunk_size)))
+    expected = find_duplicates(list(zip(df['Ticket'], df['Pclass'])))
+    print(f"=== {rows:,} passengers, keys {keys} ===")
+    print(f"find_duplicate_rows: {rows_time:.2f}s, "
+          f"same as dict: {list(duplicated.itertuples(index=False, name=None)) == expected}")
+    print(f"row_keys + chunked: {hash_time:.2f}s, "
+          f"same rows: {np.array_equal(hashed, row_keys(duplicated))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# Benchmark: FizzBuzz labels per second - print loop vs generator vs NumPy bulk codes
+# python -m benchmarks.bench_fizzbuzz --numbers 1e6,1e8
+import argparse
+import io
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from benchmarks.common import parse_rows, timed
+from fizzbuzz import bulk_codes, code_words, iter_labels, write_labels
+
+
+def print_loop(stop):
+    # The original: one print per number
+    for n in range(1, stop):
+        if n % 3 == 0 and n % 5 == 0:
+            print("FizzBuzz")
+        elif n % 3 == 0:
+            print("Fizz")
+        elif n % 5 == 0:
+            print("Buzz")
+        else:
+            print(n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FizzBuzz labelling throughput')
+    parser.add_argument('--numbers', default='1e6,1e7')
+    parser.add_argument('--loop-limit', type=float, default=1e6,
+                        help='skip the per-number Python versions above this many numbers')
+    args = parser.parse_args()
+
+    for count in parse_rows(args.numbers):
+        print(f"=== {count:,} numbers ===")
+        codes_time, codes = timed(bulk_codes, 1, count + 1)
+        print(f"bulk_codes: {codes_time:.3f}s, {count / codes_time / 1e6:.0f} M/s")
+
+        text_time, _ = timed(write_labels, io.StringIO(), 1, count + 1)
+        print(f"write_labels (text): {text_time:.2f}s, {count / text_time / 1e6:.1f} M/s")
+
+        if count <= args.loop_limit:
+            def printed():
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    print_loop(count + 1)
+                return output.getvalue()
+
+            print_time, expected = timed(printed)
+            generator_time, labels = timed(lambda: list(iter_labels(1, count + 1)))
+            output = io.StringIO()
+            write_labels(output, 1, count + 1)
+            words = code_words()
+            label_codes = [0 if label.isdigit() else words.index(label) for label in labels]
+            print(f"print loop: {print_time:.2f}s, {count / print_time / 1e6:.1f} M/s")
+            print(f"iter_labels: {generator_time:.2f}s, {count / generator_time / 1e6:.1f} M/s")
+            print(f"same text: {output.getvalue() == expected}, "
+                  f"same codes: {np.array_equal(codes, label_codes)}")
+
+
+if __name__ == '__main__':
+    main()
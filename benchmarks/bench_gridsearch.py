@@ -0,0 +1,76 @@
+# Benchmark: grid search over the scoring model points / threshold (gridsearch.py)
+# vs scoring every candidate row by row the way scoring.score does, checked for the same
+# confusion matrices
+# python -m benchmarks.bench_gridsearch --rows 1e6,1e7 --workers 1,4
+import argparse
+
+import numpy as np
+
+from benchmarks.common import parse_rows, timed
+from gridsearch import candidate_grid, fold_ids, pattern_counts, search
+from preprocessing import Preprocessor
+from scoring import CONDITIONS, condition_masks
+from titanic_data import load_titanic
+
+FOLDS = 5
+
+
+def direct_counts(df, conditions, weights, thresholds, folds):
+    # One candidate at a time over all rows: points per row, then four masked sums per fold
+    masks = condition_masks(df, conditions)
+    survived = df['Survived'].to_numpy() == 1
+    result = np.zeros((FOLDS, len(weights), 4), dtype=np.int64)
+    for index, (points, threshold) in enumerate(zip(weights, thresholds)):
+        total = np.zeros(len(df), dtype=np.int8)
+        for name, value in zip(conditions, points):
+            total += masks[name].astype(np.int8) * value
+        predicted = total >= threshold
+        for fold in range(FOLDS):
+            rows = folds == fold
+            result[fold, index] = [(rows & ~survived & ~predicted).sum(), (rows & ~survived & predicted).sum(),
+                                   (rows & survived & ~predicted).sum(), (rows & survived & predicted).sum()]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='grid search / cross-validation speed')
+    parser.add_argument('--rows', default='1e6,1e7')
+    parser.add_argument('--workers', default='1,4')
+    parser.add_argument('--sample', type=int, default=20, help='candidates scored directly')
+    args = parser.parse_args()
+
+    conditions = list(CONDITIONS)
+    train = load_titanic('train.csv')
+    train = Preprocessor().fit(train).transform(train)[['Survived', 'Sex', 'Pclass', 'Age', 'Fare']]
+    for n_rows in parse_rows(args.rows):
+        picks = np.random.default_rng(0).integers(0, len(train), n_rows)
+        df = train.iloc[picks].reset_index(drop=True)
+        print(f"=== {n_rows:,} rows ===")
+
+        counts = None
+        for workers in parse_rows(args.workers):
+            count_time, worker_counts = timed(pattern_counts, df, conditions, FOLDS, 0, workers)
+            same = '' if counts is None else f", same as before: {np.array_equal(worker_counts, counts)}"
+            print(f"pattern counts, {workers} worker(s): {count_time:.3f}s{same}")
+            counts = worker_counts
+        search_time, result = timed(search, counts, conditions, prune=False, repeat=3)
+        prune_time, pruned = timed(search, counts, conditions, repeat=3)
+        print(f"search: {result['grid']} grid candidates, {result['candidates']} kept, "
+              f"{search_time * 1000:.1f} ms ({prune_time * 1000:.1f} ms with pruning, "
+              f"{len(pruned['thresholds'])} left)")
+
+        # Same confusion matrices as scoring candidates directly (models + a random sample)
+        rng = np.random.default_rng(1)
+        sample = np.concatenate([np.arange(result['models']),
+                                 rng.choice(np.arange(result['models'], result['candidates']),
+                                            args.sample, replace=False)])
+        direct_time, expected = timed(direct_counts, df, conditions, result['weights'][sample],
+                                      result['thresholds'][sample], fold_ids(n_rows, FOLDS, 0))
+        grid = len(candidate_grid(conditions)[0])
+        print(f"direct scoring: {direct_time / len(sample) * 1000:.0f} ms per candidate "
+              f"(~{direct_time / len(sample) * grid:.0f}s for the whole grid), "
+              f"same counts: {np.array_equal(result['fold_counts'][:, sample], expected)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Benchmark: peak memory of the day4_advanced_pandas feature / correlation / export steps,
+# the old way (full df.copy() for .corr(), another copy for the export) vs now
+# python -m benchmarks.bench_memory --rows 1e6
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+import synthetic
+from benchmarks.common import parse_rows, timed
+from day4_advanced_pandas import CORRELATION_COLUMNS
+from features import ENRICHED_COLUMNS, decks, fare_categories, is_alone, name_features
+from reports import column_correlations
+from titanic_data import load_titanic
+
+
+def add_script_columns(df):
+    # The columns the script adds before the correlation step
+    df['FareCategory'] = fare_categories(df['Fare'])
+    df['Age_Filled'] = df['Age'].fillna(df['Age'].median())
+    df['Embarked_Filled'] = df['Embarked'].fillna(df['Embarked'].mode()[0])
+    names = name_features(df['Name'])
+    df['Title'] = names['Title']
+    df['Title_Simple'] = names['Title_Simple']
+    df['IsAlone'] = is_alone(df)
+    df['Deck'] = decks(df['Cabin'])
+
+
+# All of these take a frame that already has the script's columns
+def old_correlations(df):
+    df_numeric = df.copy()
+    df_numeric['Sex_Numeric'] = (df['Sex'] == 'female').astype(int)
+    df_numeric['Embarked_Numeric'] = df['Embarked'].map({'S': 0, 'C': 1, 'Q': 2})
+    return df_numeric[CORRELATION_COLUMNS].corr()['Survived']
+
+
+def new_correlations(df):
+    return column_correlations(df, CORRELATION_COLUMNS)
+
+
+def old_way(df, output):
+    result = old_correlations(df)
+    df_enriched = df[ENRICHED_COLUMNS].copy()
+    df_enriched.to_csv(output, index=False)
+    return result
+
+
+def new_way(df, output):
+    result = new_correlations(df)
+    df[ENRICHED_COLUMNS].to_csv(output, index=False)
+    return result
+
+
+def peak_mb(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='memory use of the enrich / correlate / export steps')
+    parser.add_argument('--rows', default='1e6')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'passengers.csv')
+            synthetic.write(source, n_rows)
+            base = load_titanic(source)
+            output = os.path.join(tmp, 'enriched.csv')
+
+            add_script_columns(base)
+            print(f"=== {n_rows:,} rows, frame with features {base.memory_usage(deep=True).sum() / 1e6:.0f} MB ===")
+
+            # Correlation + export: peak memory on top of the frame itself
+            old_peak, expected = peak_mb(old_way, base, output)
+            new_peak, result = peak_mb(new_way, base, output)
+            old_time, _ = timed(old_way, base, output)
+            new_time, _ = timed(new_way, base, output)
+            print(f"old (df.copy() + .corr() matrix + export copy): peak {old_peak:.0f} MB, {old_time:.2f}s")
+            print(f"new (column buffers, one correlation vector):   peak {new_peak:.0f} MB, {new_time:.2f}s")
+            print(f"same correlations: {np.allclose(result[expected.index], expected)}")
+
+            old_corr, _ = peak_mb(old_correlations, base)
+            new_corr, _ = peak_mb(new_correlations, base)
+            old_time, _ = timed(old_correlations, base, repeat=3)
+            new_time, _ = timed(new_correlations, base, repeat=3)
+            print(f"correlation alone: peak {old_corr:.0f} MB -> {new_corr:.0f} MB, "
+                  f"{old_time * 1000:.0f} ms -> {new_time * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
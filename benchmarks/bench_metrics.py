@@ -0,0 +1,85 @@
+# Benchmark: confusion matrices for many models - four mask sums + a separate accuracy per
+# model (the old day4_prediction_model.py way) vs metrics.confusion_matrices, and
+# streaming a scored CSV vs loading it whole
+# python -m benchmarks.bench_metrics --rows 1e6,1e7 --models 4,64
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import parse_rows, timed
+from metrics import confusion_matrices, evaluate, evaluate_file
+
+
+def mask_sums(df, models):
+    # The old way, for every model
+    counts = []
+    for model in models:
+        tp = ((df[model] == 1) & (df['Survived'] == 1)).sum()
+        fp = ((df[model] == 1) & (df['Survived'] == 0)).sum()
+        tn = ((df[model] == 0) & (df['Survived'] == 0)).sum()
+        fn = ((df[model] == 0) & (df['Survived'] == 1)).sum()
+        (df[model] == df['Survived']).mean()
+        counts.append([tn, fp, fn, tp])
+    return np.array(counts)
+
+
+def scored_frame(n_rows, n_models, seed=0):
+    # Survived plus models that agree with it ~60-90% of the time
+    rng = np.random.default_rng(seed)
+    survived = (rng.random(n_rows) < 0.38).astype(np.int8)
+    columns = {'Survived': survived}
+    for index in range(n_models):
+        flip = rng.random(n_rows) < 0.1 + 0.3 * index / max(n_models, 1)
+        columns[f"Prediction_{index + 1}"] = survived ^ flip
+    return pd.DataFrame(columns)
+
+
+def evaluate_whole(path):
+    df = pd.read_csv(path)
+    return evaluate(df['Survived'], df.drop(columns='Survived'))
+
+
+def peak_mb(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='batched confusion matrices vs per-model mask sums')
+    parser.add_argument('--rows', default='1e6,1e7')
+    parser.add_argument('--models', default='4,64')
+    parser.add_argument('--csv-rows', type=float, default=1e6, help='rows in the streamed CSV')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        for n_models in parse_rows(args.models):
+            df = scored_frame(n_rows, n_models)
+            models = [column for column in df.columns if column != 'Survived']
+            print(f"=== {n_rows:,} rows x {n_models} models ===")
+            old_time, expected = timed(mask_sums, df, models)
+            new_time, counts = timed(confusion_matrices, df['Survived'], df[models])
+            print(f"mask sums per model: {old_time:.3f}s")
+            print(f"confusion_matrices:  {new_time:.3f}s ({old_time / new_time:.1f}x), "
+                  f"same counts: {np.array_equal(counts, expected)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scored.csv')
+        df = scored_frame(int(args.csv_rows), 4)
+        df.to_csv(path, index=False)
+        whole_peak, expected = peak_mb(evaluate_whole, path)
+        stream_peak, table = peak_mb(evaluate_file, path, None, 'Survived', 100_000)
+        print(f"=== {int(args.csv_rows):,} row scored CSV ===")
+        print(f"read whole file: peak {whole_peak:.0f} MB; streamed in 100k chunks: peak {stream_peak:.0f} MB, "
+              f"same table: {table.equals(expected)}")
+        print(table.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Benchmark: chained .str calls vs the memoized name/cabin extractor
+# python -m benchmarks.bench_names --rows 1e6
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from features import TITLE_MAPPING, decks, name_features, parse_name
+
+
+def chained_str(df):
+    # What day4_advanced_pandas.py / day4_titanic_analysis.py did before
+    title = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+    return pd.DataFrame({
+        'Title': title,
+        'Title_Simple': title.map(TITLE_MAPPING),
+        'FirstName': df['Name'].str.split(',').str[1].str.split('.').str[1]
+                               .str.strip().str.split().str[0],
+        'Surname': df['Name'].str.split(',').str[0].str.strip(),
+        'Deck': df['Cabin'].str[0],
+    })
+
+
+def extractor(df):
+    features = name_features(df['Name'])
+    features['Deck'] = decks(df['Cabin'])
+    return features
+
+
+def same_values(left, right):
+    for column in left.columns:
+        a = left[column].astype(object).where(left[column].notna(), None)
+        b = right[column].astype(object).where(right[column].notna(), None)
+        if not a.equals(b):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='chained .str vs name extractor')
+    parser.add_argument('--rows', default='1e6')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = make_passengers(n_rows)
+        print(f"\n=== {n_rows:,} rows, {df['Name'].nunique():,} distinct names ===")
+        slow_time, slow = timed(chained_str, df)
+        parse_name.cache_clear()
+        cold_time, fast = timed(extractor, df)
+        warm_time, _ = timed(extractor, df)
+        print(f"chained .str: {slow_time:.2f}s")
+        print(f"extractor:    {cold_time:.2f}s cold cache ({slow_time / cold_time:.0f}x), "
+              f"{warm_time:.2f}s warm cache ({slow_time / warm_time:.0f}x)")
+        print(f"same values: {same_values(slow, fast)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# Benchmark: serial vs shared-memory parallel feature + scoring pipeline
+# On synthetic.py passengers: copies of the 891 real rows (make_passengers) have only
+# 891 distinct names, which hides the cost of parsing the titles.
+# python -m benchmarks.bench_parallel --rows 1e7 --workers 1,2,4,8,16,32
+import argparse
+import os
+
+import pandas as pd
+
+import synthetic
+from benchmarks.common import parse_rows, timed
+from parallel import column_arrays, run_parallel, run_serial
+from titanic_data import TITANIC_DTYPES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='serial vs parallel pipeline')
+    parser.add_argument('--rows', default='1e6')
+    parser.add_argument('--workers', default=','.join(
+        str(n) for n in [1, 2, 4, 8, 16, 32] if n <= (os.cpu_count() or 1)))
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = pd.concat(synthetic.generate(n_rows), ignore_index=True)
+        df = df.astype({'Sex': TITANIC_DTYPES['Sex'], 'Embarked': TITANIC_DTYPES['Embarked']})
+        print(f"\n=== {n_rows:,} rows, {df['Name'].nunique():,} distinct names, {os.cpu_count()} cores ===")
+        serial_time, expected = timed(run_serial, df)
+        # The part every parallel run still does in the parent before the workers start
+        prepare_time, _ = timed(column_arrays, df)
+        print(f"serial: {serial_time:.2f}s (building the shared inputs: {prepare_time:.2f}s)")
+        for workers in parse_rows(args.workers):
+            parallel_time, result = timed(run_parallel, df, workers)
+            print(f"{workers:>2} workers: {parallel_time:.2f}s, "
+                  f"speedup {serial_time / parallel_time:.1f}x, identical={result.equals(expected)}")
+
+
+if __name__ == '__main__':
+    main()
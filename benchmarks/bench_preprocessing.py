@@ -0,0 +1,65 @@
+# Benchmark: preparing passengers for scoring - refit on every frame (the old
+# day4_prediction_model.py way) vs a Preprocessor fitted once and saved
+# python -m benchmarks.bench_preprocessing --rows 1e6
+import argparse
+import os
+import tempfile
+
+import preprocessing
+import synthetic
+from benchmarks.common import parse_rows, timed
+from preprocessing import Preprocessor
+from streaming import read_chunks
+from titanic_data import load_titanic, titanic_dtypes
+
+
+def refit(df):
+    # Fills and categories learned from this frame itself, then applied
+    return Preprocessor().fit(df).transform(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='fit-once preprocessing vs refitting every frame')
+    parser.add_argument('--rows', default='1e5,1e6')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    # test.csv (one missing Fare) prepared with the train.csv state
+    train = load_titanic('train.csv')
+    state = Preprocessor().fit(train)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = state.save(os.path.join(tmp, 'preprocessor.json'))
+        size = os.path.getsize(path)
+        load_time, loaded = timed(preprocessing.load, path, repeat=20)
+    raw = load_titanic('test.csv')
+    missing = raw['Fare'].isna()
+    test = loaded.transform(raw.copy())
+    print(f"state: {size} bytes, load {load_time * 1e6:.0f} us")
+    print(f"test.csv: {test['Fare'].isna().sum()} missing Fare left, filled with the train median: "
+          f"{bool((test.loc[missing, 'Fare'] == state.fills['Fare']).all())}")
+
+    for n_rows in parse_rows(args.rows):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'passengers.csv')
+            synthetic.write(source, n_rows)
+            base = load_titanic(source)
+            print(f"=== {n_rows:,} rows ===")
+
+            fit_time, fitted = timed(lambda: Preprocessor().fit(base), repeat=3)
+            refit_time, expected = timed(lambda: refit(base.copy()), repeat=3)
+            transform_time, result = timed(lambda: fitted.transform(base.copy()), repeat=3)
+            same = result.equals(expected[result.columns])
+            print(f"refit every time: {refit_time:.3f}s")
+            print(f"fit once:         {fit_time:.3f}s, then transform {transform_time:.3f}s "
+                  f"({n_rows / transform_time / 1e6:.1f} M rows/s), same columns: {same}")
+
+            chunks = list(read_chunks(source, args.chunksize, dtype=titanic_dtypes(source)))
+            refit_time, _ = timed(lambda: [refit(chunk.copy()) for chunk in chunks])
+            transform_time, _ = timed(lambda: [fitted.transform(chunk.copy()) for chunk in chunks])
+            refitted = {(chunk['Age'].median(), chunk['Fare'].median()) for chunk in chunks}
+            print(f"{len(chunks)} chunks: refit {refit_time:.3f}s ({len(refitted)} different "
+                  f"Age/Fare fills), saved state {transform_time:.3f}s (1 set of fills)")
+
+
+if __name__ == '__main__':
+    main()
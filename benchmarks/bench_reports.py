@@ -0,0 +1,43 @@
+# Benchmark: one groupby per report vs the shared-codes report engine
+# python -m benchmarks.bench_reports --rows 1e6
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from reports import TITANIC_REPORTS, add_report_features, titanic_tables
+
+
+def separate_groupbys(df):
+    # What the scripts do today: a full groupby scan per table
+    tables = {}
+    for name, (keys, metrics) in TITANIC_REPORTS.items():
+        if metrics == ['size']:
+            tables[name] = df.groupby(keys).size()
+        else:
+            tables[name] = df.groupby(keys)['Survived'].agg(metrics)
+    tables['pivot'] = df.pivot_table(values='Survived', index='Pclass', columns='Sex', aggfunc='mean')
+    tables['crosstab'] = pd.crosstab(df['Pclass'], df['Survived'], margins=True)
+    tables['crosstab_pct'] = pd.crosstab(df['Pclass'], df['Survived'], normalize='index') * 100
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description='separate groupbys vs report engine')
+    parser.add_argument('--rows', default='1e6')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = add_report_features(make_passengers(n_rows))
+        print(f"\n=== {n_rows:,} rows, {len(TITANIC_REPORTS) + 3} tables ===")
+        slow_time, slow = timed(separate_groupbys, df, repeat=3)
+        fast_time, fast = timed(titanic_tables, df, repeat=3)
+        same = (fast['crosstab'].equals(slow['crosstab'])
+                and np.allclose(fast['pivot'].to_numpy(), slow['pivot'].to_numpy()))
+        print(f"separate groupbys: {slow_time:.3f}s")
+        print(f"report engine:     {fast_time:.3f}s ({slow_time / fast_time:.1f}x faster), same tables: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Benchmark + regression check: inferred dtypes vs the typed Titanic loader
+# The day4_advanced_pandas.py tables must come out the same with both loaders.
+# python -m benchmarks.bench_schema --rows 891,1e6
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from titanic_data import load_titanic, memory_mb
+
+
+def advanced_pandas_tables(df):
+    # The grouped outputs printed by day4_advanced_pandas.py
+    df = df.copy()
+    df['FareCategory'] = pd.cut(df['Fare'], bins=[0, 10, 30, 100, 600],
+                                labels=['Budget', 'Standard', 'Premium', 'Luxury'])
+    df['Deck'] = df['Cabin'].str[0]
+    return {
+        'pivot': df.pivot_table(values='Survived', index='Pclass', columns='Sex', aggfunc='mean'),
+        'crosstab': pd.crosstab(df['Pclass'], df['Survived'], margins=True),
+        'crosstab_pct': pd.crosstab(df['Pclass'], df['Survived'], normalize='index') * 100,
+        'multi_group': df.groupby(['Pclass', 'Sex'])['Survived'].agg(
+            [('count', 'count'), ('survived', 'sum'), ('survival_rate', 'mean')]),
+        'fare_survival': df.groupby('FareCategory')['Survived'].mean() * 100,
+        'deck_survival': df.groupby('Deck')['Survived'].mean() * 100,
+        'missing': df.isnull().sum(),
+    }
+
+
+def check_same_tables(inferred, typed):
+    # Same values and labels; only the storage types (int8, category) may differ
+    for name, expected in advanced_pandas_tables(inferred).items():
+        actual = advanced_pandas_tables(typed)[name]
+        if isinstance(expected, pd.DataFrame):
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False,
+                                          check_index_type=False, check_column_type=False,
+                                          check_categorical=False)
+        else:
+            pd.testing.assert_series_equal(actual, expected, check_dtype=False,
+                                           check_index_type=False, check_categorical=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='inferred vs typed loading')
+    parser.add_argument('--rows', default='891,1e6')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in parse_rows(args.rows):
+            path = os.path.join(tmp, 'passengers.csv')
+            make_passengers(n_rows).to_csv(path, index=False)
+            print(f"\n=== {n_rows:,} rows ===")
+
+            inferred_time, inferred = timed(pd.read_csv, path)
+            typed_time, typed = timed(load_titanic, path)
+            print(f"load: inferred {inferred_time:.2f}s, typed {typed_time:.2f}s")
+            print(f"memory: inferred {memory_mb(inferred):.1f} MB, typed {memory_mb(typed):.1f} MB "
+                  f"({memory_mb(inferred) / memory_mb(typed):.1f}x smaller)")
+
+            for keys in ['Sex', ['Pclass', 'Sex'], 'Embarked']:
+                slow, _ = timed(lambda: inferred.groupby(keys)['Survived'].mean(), repeat=3)
+                fast, _ = timed(lambda: typed.groupby(keys)['Survived'].mean(), repeat=3)
+                print(f"groupby {keys}: inferred {slow * 1000:.1f} ms, typed {fast * 1000:.1f} ms")
+
+            check_same_tables(inferred, typed)
+            print("day4_advanced_pandas tables unchanged: True")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Benchmark: row-wise df.apply rules vs the vectorized scoring engine
+# python -m benchmarks.bench_scoring --rows 1e6,1e7
+import argparse
+
+import numpy as np
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from scoring import MODELS, predict, predict_all
+
+
+# The original row functions from day4_prediction_model.py, kept here as the baseline
+def simple_model_1(row):
+    return 1 if row['Sex'] == 'female' else 0
+
+
+def simple_model_2(row):
+    if row['Sex'] == 'female':
+        return 1
+    elif row['Age'] < 18:
+        return 1
+    else:
+        return 0
+
+
+def simple_model_3(row):
+    if row['Sex'] == 'female':
+        return 1
+    elif row['Pclass'] == 1:
+        return 1
+    else:
+        return 0
+
+
+def simple_model_4(row):
+    score = 0
+    if row['Sex'] == 'female':
+        score += 2
+    if row['Pclass'] == 1:
+        score += 1
+    if row['Age'] < 18:
+        score += 1
+    if row['Fare'] > 50:
+        score += 1
+    return 1 if score >= 2 else 0
+
+
+ROW_MODELS = {
+    'Prediction_1': simple_model_1,
+    'Prediction_2': simple_model_2,
+    'Prediction_3': simple_model_3,
+    'Prediction_4': simple_model_4,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='df.apply rules vs vectorized scoring')
+    parser.add_argument('--rows', default='1e6,1e7', help='comma separated row counts')
+    parser.add_argument('--apply-max-rows', type=float, default=1e7,
+                        help='skip the (slow) df.apply path above this many rows')
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = make_passengers(n_rows)
+        print(f"\n=== {n_rows:,} rows ===")
+
+        all_time, all_predictions = timed(predict_all, df)
+        print(f"predict_all (4 models, shared masks): {all_time:.3f}s")
+
+        for model, row_func in ROW_MODELS.items():
+            fast_time, fast = timed(predict, df, model, repeat=3)
+            line = f"{model} ({MODELS[model]['name']}): vectorized {fast_time:.3f}s"
+            if n_rows <= args.apply_max_rows:
+                slow_time, slow = timed(df.apply, row_func, axis=1)
+                same = np.array_equal(slow.to_numpy(), fast)
+                line += f", apply {slow_time:.2f}s, {slow_time / fast_time:,.0f}x faster, identical={same}"
+            else:
+                line += ", apply skipped"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# Load test for service.py: starts a local instance, sends concurrent requests over
+# keep-alive connections, and reports client-side latency and throughput next to
+# the server's own /stats. Also checks the answers against scoring offline.
+# python -m benchmarks.bench_service --connections 64 --requests 200
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import predict_all
+from service import records_frame
+from sketches import exact_fill_values
+from titanic_data import load_titanic
+
+
+async def call(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    await reader.readline()  # status line
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+
+async def client(port, payloads, latencies, answers):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for index, payload in payloads:
+        start = time.perf_counter()
+        reply = await call(reader, writer, 'POST', '/predict', payload)
+        latencies.append(time.perf_counter() - start)
+        answers[index] = reply
+    writer.close()
+
+
+async def load_test(port, records, connections, requests, batch):
+    # Request i carries `batch` records (a single object when batch == 1)
+    payloads = []
+    for i in range(connections * requests):
+        chunk = records[(i * batch) % len(records):][:batch] or records[:batch]
+        payloads.append((i, chunk[0] if batch == 1 else chunk))
+    latencies = []
+    answers = {}
+    start = time.perf_counter()
+    await asyncio.gather(*[client(port, payloads[c::connections], latencies, answers)
+                           for c in range(connections)])
+    elapsed = time.perf_counter() - start
+    return payloads, answers, np.array(latencies) * 1000, elapsed
+
+
+async def fetch_stats(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    stats = await call(reader, writer, 'GET', '/stats')
+    writer.close()
+    return stats
+
+
+async def wait_for_server(port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"service didn't start on port {port}")
+
+
+def passenger_records(path):
+    # JSON-ready records with gaps left as null (test.csv has a missing Fare)
+    df = pd.read_csv(path)[['Sex', 'Pclass', 'Age', 'Fare']]
+    return [{key: (None if pd.isna(value) else value) for key, value in record.items()}
+            for record in df.astype(object).to_dict('records')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='prediction service load test')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=100, help='per connection')
+    parser.add_argument('--batch', default='1,32', help='records per request, one run each')
+    parser.add_argument('--data', default='test.csv')
+    args = parser.parse_args()
+
+    server = subprocess.Popen([sys.executable, 'service.py', '--port', str(args.port)],
+                              stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_for_server(args.port))
+        records = passenger_records(args.data)
+        fills = exact_fill_values(load_titanic('train.csv'))
+        expected = predict_all(records_frame(records, fills))['Prediction_4'].tolist()
+
+        for batch in [int(size) for size in args.batch.split(',')]:
+            payloads, answers, latencies, elapsed = asyncio.run(
+                load_test(args.port, records, args.connections, args.requests, batch))
+            rows = len(payloads) * batch
+            correct = True
+            for index, payload in payloads:
+                got = [answers[index]['prediction']] if batch == 1 else answers[index]['predictions']
+                sent = [payload] if batch == 1 else payload
+                correct &= got == [expected[records.index(record)] for record in sent]
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"=== {args.connections} connections x {args.requests} requests, "
+                  f"{batch} record(s) each ===")
+            print(f"client: {len(payloads) / elapsed:,.0f} requests/s, {rows / elapsed:,.0f} rows/s, "
+                  f"p50 {p50:.2f} ms, p99 {p99:.2f} ms, same as offline scoring: {correct}")
+
+        stats = asyncio.run(fetch_stats(args.port))
+        print("server /stats:", json.dumps(stats, indent=1))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Benchmark: exact median / mode vs merged streaming sketches
+# python -m benchmarks.bench_sketches --rows 1e6 --chunksize 100000
+import argparse
+
+import numpy as np
+
+from benchmarks.common import make_passengers, parse_rows, timed
+from sketches import exact_fill_values, fill_sketches, fill_values_from
+
+
+def rank_error(values, estimate):
+    # How far the estimate's rank is from the true median rank (0.5)
+    values = values[~np.isnan(values)]
+    low = np.searchsorted(np.sort(values), estimate, side='left') / len(values)
+    high = np.searchsorted(np.sort(values), estimate, side='right') / len(values)
+    return 0.0 if low <= 0.5 <= high else min(abs(low - 0.5), abs(high - 0.5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='exact vs sketched fill values')
+    parser.add_argument('--rows', default='1e6')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--error', type=float, default=0.01)
+    args = parser.parse_args()
+
+    for n_rows in parse_rows(args.rows):
+        df = make_passengers(n_rows)
+        # Give the numbers some spread so duplicates don't hide the error
+        df['Fare'] = df['Fare'] * np.random.default_rng(1).uniform(0.5, 1.5, n_rows)
+        chunks = [df.iloc[start:start + args.chunksize]
+                  for start in range(0, n_rows, args.chunksize)]
+        print(f"\n=== {n_rows:,} rows, {len(chunks)} chunks, error={args.error} ===")
+
+        exact_time, exact = timed(exact_fill_values, df)
+
+        def sketch_per_chunk_then_merge():
+            parts = [fill_sketches([chunk], args.error) for chunk in chunks]
+            for part in parts[1:]:
+                for name in parts[0]:
+                    parts[0][name].merge(part[name])
+            return parts[0]
+
+        sketch_time, sketches = timed(sketch_per_chunk_then_merge)
+        approx = fill_values_from(sketches)
+        print(f"exact: {exact_time:.3f}s, sketches (built per chunk, merged): {sketch_time:.3f}s")
+        for column in ['Age', 'Fare']:
+            error = rank_error(df[column].to_numpy(dtype=float), approx[column])
+            print(f"{column} median: exact {exact[column]:.4f}, sketch {approx[column]:.4f}, "
+                  f"rank error {error:.4f}, items kept {sketches[column].size():,}")
+        print(f"Embarked mode: exact {exact['Embarked']}, sketch {approx['Embarked']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Benchmark: full pd.read_csv reports vs chunked streaming reports
+# Peak memory comes from tracemalloc (NumPy and pandas allocations are traced)
+# python -m benchmarks.bench_streaming --rows 1e5,1e6
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.common import make_passengers, parse_rows
+from streaming import add_titanic_features, titanic_reports
+
+
+def full_load_reports(path):
+    # What the day4 scripts do today: load everything, then group
+    df = pd.read_csv(path)
+    missing = df.isnull().sum()
+    df = add_titanic_features(df)
+    reports = {key: df.groupby(key)['Survived'].agg(['count', 'sum', 'mean'])
+               for key in ['Sex', 'Pclass', 'AgeGroup', 'FamilySize', 'Embarked', 'FareCategory']}
+    reports['pivot'] = df.pivot_table(values='Survived', index='Pclass', columns='Sex', aggfunc='mean')
+    reports['crosstab'] = pd.crosstab(df['Pclass'], df['Survived'], margins=True)
+    reports['missing'] = missing
+    return reports
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='full load vs streaming reports')
+    parser.add_argument('--rows', default='1e5,1e6')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in parse_rows(args.rows):
+            path = os.path.join(tmp, f'passengers_{n_rows}.csv')
+            make_passengers(n_rows).to_csv(path, index=False)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"\n=== {n_rows:,} rows ({size_mb:.0f} MB CSV) ===")
+
+            full_time, full_peak, full = measure(full_load_reports, path)
+            stream_time, stream_peak, stream = measure(titanic_reports, path, args.chunksize)
+            same = full['crosstab'].equals(stream['crosstab']) and full['missing'].equals(stream['missing'])
+
+            print(f"full load: {full_time:.2f}s, {size_mb / full_time:.0f} MB/s, peak {full_peak:.0f} MB")
+            print(f"streaming: {stream_time:.2f}s, {size_mb / stream_time:.0f} MB/s, peak {stream_peak:.0f} MB")
+            print(f"same crosstab and missing counts: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Benchmark: training the learned models (training.py) vs scoring the hand-written rules
+#   - in memory: train.csv rows resampled to --rows, one float32 matrix
+#   - streaming: a synthetic CSV (synthetic.py) read in chunks on every pass,
+#     checked against training on the same rows in memory; accuracy on a second
+#     synthetic file the models never saw
+# python -m benchmarks.bench_training --rows 1e6,1e7 --stream-rows 1e6
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+import synthetic
+from benchmarks.common import parse_rows, timed
+from preprocessing import Preprocessor
+from scoring import MODELS, predict_all
+from titanic_data import load_titanic
+from training import (HistogramTree, LogisticRegression, accuracy, csv_batches, feature_matrix,
+                      targets)
+
+
+def learners():
+    return [('logistic regression', LogisticRegression()),
+            ('decision stump', HistogramTree(max_depth=1)),
+            ('tree (depth 3)', HistogramTree(max_depth=3))]
+
+
+def in_memory(n_rows, df):
+    picks = np.random.default_rng(0).integers(0, len(df), n_rows)
+    frame = df[['Sex', 'Pclass', 'Age', 'Fare']].iloc[picks]
+    X = feature_matrix(df)[picks]
+    y = targets(df)[picks]
+    print(f"=== {n_rows:,} rows in memory ({X.nbytes / 1e6:.0f} MB float32 matrix) ===")
+
+    rules_time, rules = timed(predict_all, frame)
+    best_rule = max(accuracy(rules[model].to_numpy(), y) for model in MODELS)
+    print(f"{'rules (all 4, scoring only)':<28} {rules_time:7.2f}s  best {best_rule:.1f}%")
+    for name, learner in learners():
+        fit_time, _ = timed(learner.fit, X, y)
+        predict_time, predictions = timed(learner.predict, X)
+        print(f"{name:<28} {fit_time:7.2f}s  {accuracy(predictions, y):.1f}% "
+              f"(predict {predict_time:.2f}s)")
+
+
+def streaming(n_rows, chunksize):
+    with tempfile.TemporaryDirectory() as tmp:
+        train_csv = os.path.join(tmp, 'train.csv')
+        test_csv = os.path.join(tmp, 'test.csv')
+        synthetic.write(train_csv, n_rows, seed=1)
+        synthetic.write(test_csv, n_rows // 4, seed=2)
+        preprocessor = Preprocessor().fit(load_titanic(train_csv))
+        train = preprocessor.transform(load_titanic(train_csv))
+        test = preprocessor.transform(load_titanic(test_csv))
+        X, y = feature_matrix(train), targets(train)
+        X_test, y_test = feature_matrix(test), targets(test)
+        batches = csv_batches(train_csv, preprocessor, chunksize)
+        print(f"=== {n_rows:,} synthetic rows streamed in chunks of {chunksize:,}, "
+              f"{len(test):,} unseen rows ===")
+
+        rules = predict_all(test)
+        for model in MODELS:
+            print(f"{MODELS[model]['name']:<28} {'':>8} {accuracy(rules[model].to_numpy(), y_test):5.1f}%")
+        for (name, streamed), (_, loaded) in zip(learners(), learners()):
+            stream_time, _ = timed(streamed.fit_batches, batches)
+            loaded.fit(X, y)
+            predictions = streamed.predict(X_test)
+            same = np.array_equal(predictions, loaded.predict(X_test))
+            print(f"{name:<28} {stream_time:7.2f}s {accuracy(predictions, y_test):5.1f}% "
+                  f"(same predictions as in memory: {same})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='learned model training speed and accuracy vs the rules')
+    parser.add_argument('--rows', default='1e6,1e7')
+    parser.add_argument('--stream-rows', default='1e6')
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    args = parser.parse_args()
+
+    df = Preprocessor().fit(load_titanic('train.csv')).transform(load_titanic('train.csv'))
+    for n_rows in parse_rows(args.rows):
+        in_memory(n_rows, df)
+    for n_rows in parse_rows(args.stream_rows):
+        streaming(n_rows, args.chunksize)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Benchmark: count_words on the whole text vs the blocked / parallel file mode
+# python -m benchmarks.bench_words --mb 500 --workers 1,4,8
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import parse_rows, timed
+from word_counter import count_words, count_words_in_file, top_words
+
+
+def write_corpus(path, megabytes, seed=0):
+    # Zipf-like word frequencies, like real text and logs
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"word{i}" for i in range(50_000)])
+    with open(path, 'w') as f:
+        written = 0
+        while written < megabytes * 1e6:
+            words = vocabulary[np.minimum(rng.zipf(1.2, 200_000), len(vocabulary)) - 1]
+            line = ' '.join(words) + '\n'
+            f.write(line)
+            written += len(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='word counting throughput')
+    parser.add_argument('--mb', type=float, default=200)
+    parser.add_argument('--workers', default='1,' + str(os.cpu_count() or 1))
+    parser.add_argument('--block-mb', type=float, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'corpus.txt')
+        write_corpus(path, args.mb)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"=== {size_mb:.0f} MB corpus ===")
+
+        def read_and_count():
+            with open(path) as f:
+                return count_words(f.read())
+
+        slow_time, expected = timed(read_and_count)
+        print(f"count_words(f.read()): {slow_time:.2f}s, {size_mb / slow_time:.0f} MB/s")
+        for workers in sorted(set(parse_rows(args.workers))):
+            fast_time, counts = timed(count_words_in_file, path, workers,
+                                      int(args.block_mb * 1e6))
+            print(f"file mode, {workers} workers: {fast_time:.2f}s, {size_mb / fast_time:.0f} MB/s, "
+                  f"same counts: {dict(counts) == expected}")
+
+        heap_time, top = timed(top_words, counts, 10, repeat=3)
+        sort_time, _ = timed(lambda: sorted(counts.items(), key=lambda item: -item[1])[:10], repeat=3)
+        print(f"top 10 via heap: {heap_time * 1000:.1f} ms, full sort: {sort_time * 1000:.1f} ms")
+        print(top[:3])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+# Shared helpers for the benchmark scripts
+# Run benchmarks from the repo root, e.g. python -m benchmarks.bench_scoring
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def make_passengers(n_rows, seed=0, source='train.csv'):
+    # Bigger-than-train.csv data: resample whole passengers from the real file
+    base = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(base), size=n_rows)
+    df = base.iloc[picks].reset_index(drop=True)
+    df['PassengerId'] = np.arange(1, n_rows + 1)
+    return df
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    # Best wall time over `repeat` runs, plus the last result
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def parse_rows(text):
+    # "1e6,1e7" -> [1000000, 10000000]
+    return [int(float(part)) for part in text.split(',') if part]
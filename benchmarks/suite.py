@@ -0,0 +1,229 @@
+# Benchmark suite: every stage of the day4 Titanic work, timed and memory-profiled
+# on synthetic Titanic-schema data (synthetic.py), with a JSON history to catch slowdowns.
+#
+# Each run appends its results to the history file. A stage "regresses" when it is
+# more than --threshold slower than its best time over the last --window runs at
+# the same size; the suite then exits with status 1 (so CI / a nightly job fails).
+#
+# python -m benchmarks.suite                       # 1e4, 1e6 and 1e7 rows
+# python -m benchmarks.suite --rows 1e4 --threshold 0.5
+# python -m benchmarks.suite --no-memory --no-save # quick look, history untouched
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic
+from benchmarks.common import make_passengers, parse_rows
+from features import decks, name_features
+from pipeline import PREDICTION_COLUMNS
+from preprocessing import Preprocessor
+from reports import column_correlations, titanic_tables
+from scoring import MODELS, predict_all
+from titanic_data import load_titanic
+
+HISTORY = os.path.join('benchmarks', 'results', 'history.json')
+CORRELATION_COLUMNS = ['Survived', 'Pclass', 'Sex_Numeric', 'Age', 'Fare', 'SibSp', 'Parch', 'IsAlone']
+
+
+# Each stage takes the shared state dict, updates it and returns the rows it handled
+def stage_load(state):
+    state['df'] = load_titanic(state['csv'])
+    return len(state['df'])
+
+
+def stage_fit(state):
+    # Fill values and categories (the medians are the expensive part)
+    state['preprocessor'] = Preprocessor().fit(state['df'])
+    return len(state['df'])
+
+
+def stage_prepare(state):
+    # Fills, 0/1 columns, family features and AgeGroup / FareCategory bins
+    state['preprocessor'].transform(state['df'])
+    return len(state['df'])
+
+
+def stage_titles(state):
+    df = state['df']
+    df['Title_Simple'] = name_features(df['Name'])['Title_Simple']
+    df['Deck'] = decks(df['Cabin'])
+    return len(df)
+
+
+def stage_reports(state):
+    state['tables'] = titanic_tables(state['df'])
+    return len(state['df'])
+
+
+def stage_correlation(state):
+    state['correlations'] = column_correlations(state['df'], CORRELATION_COLUMNS)
+    return len(state['df'])
+
+
+def stage_models(state):
+    df = state['df']
+    predictions = predict_all(df)
+    for model in MODELS:
+        df[model] = predictions[model]
+    return len(df)
+
+
+def stage_write(state):
+    df = state['df']
+    df[PREDICTION_COLUMNS].to_csv(os.path.join(state['tmp'], 'predictions.csv'), index=False)
+    df.to_csv(os.path.join(state['tmp'], 'enriched.csv'), index=False)
+    return len(df)
+
+
+STAGES = [
+    ('load_csv', stage_load),
+    ('fit_preprocess', stage_fit),
+    ('preprocess', stage_prepare),
+    ('titles', stage_titles),
+    ('reports', stage_reports),
+    ('correlation', stage_correlation),
+    ('rule_models', stage_models),
+    ('write_csv', stage_write),
+]
+
+
+def run_stages(csv, tmp, memory=False):
+    # One pass over all stages; with memory=True also the peak traced allocation per stage
+    # (tracemalloc slows things down, so timings come from a separate pass)
+    state = {'csv': csv, 'tmp': tmp}
+    results = {}
+    for name, stage in STAGES:
+        if memory:
+            tracemalloc.start()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        rows = stage(state)
+        result = {'seconds': time.perf_counter() - wall, 'cpu_seconds': time.process_time() - cpu,
+                  'rows': rows}
+        if memory:
+            result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+        results[name] = result
+    return results
+
+
+def run_size(n_rows, memory=True, repeat=1, data='synthetic'):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = os.path.join(tmp, 'passengers.csv')
+        if data == 'synthetic':
+            synthetic.write(csv, n_rows)
+        else:
+            make_passengers(n_rows).to_csv(csv, index=False)
+        results = run_stages(csv, tmp)
+        for _ in range(repeat - 1):
+            again = run_stages(csv, tmp)
+            for name in results:
+                if again[name]['seconds'] < results[name]['seconds']:
+                    results[name] = again[name]
+        if memory:
+            traced = run_stages(csv, tmp, memory=True)
+            for name in results:
+                results[name]['peak_mb'] = traced[name]['peak_mb']
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(history, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(temp_path, path)
+
+
+def regressions(run, history, threshold, window, min_seconds=0.01):
+    # (rows, stage, seconds, best earlier seconds) for every stage that got slower
+    found = []
+    for n_rows, stages in run['sizes'].items():
+        earlier = [entry['sizes'][n_rows] for entry in history
+                   if n_rows in entry['sizes'] and entry.get('data') == run.get('data')][-window:]
+        for name, result in stages.items():
+            times = [stages_before[name]['seconds'] for stages_before in earlier if name in stages_before]
+            if not times:
+                continue
+            best = min(times)
+            if result['seconds'] > max(best * (1 + threshold), min_seconds):
+                found.append((n_rows, name, result['seconds'], best))
+    return found
+
+
+def print_results(n_rows, results):
+    print(f"=== {int(n_rows):,} rows ===")
+    print(f"{'stage':<14} {'wall s':>9} {'cpu s':>9} {'peak MB':>9} {'M rows/s':>9}")
+    for name, result in results.items():
+        peak = f"{result['peak_mb']:9.1f}" if 'peak_mb' in result else f"{'-':>9}"
+        rate = result['rows'] / max(result['seconds'], 1e-9) / 1e6
+        print(f"{name:<14} {result['seconds']:9.3f} {result['cpu_seconds']:9.3f} {peak} {rate:9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Titanic pipeline benchmark suite')
+    parser.add_argument('--rows', default='1e4,1e6,1e7')
+    parser.add_argument('--data', choices=['synthetic', 'resample'], default='synthetic',
+                        help='synthetic.py passengers, or real rows copied over and over')
+    parser.add_argument('--repeat', type=int, default=1, help='best of this many timing passes')
+    parser.add_argument('--history', default=HISTORY)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fail when a stage is this much slower than its recent best (0.25 = 25%%)')
+    parser.add_argument('--window', type=int, default=5, help='how many earlier runs to compare with')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the history")
+    args = parser.parse_args(argv)
+
+    run = {
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.node(),
+        'data': args.data,
+        'sizes': {},
+    }
+    for n_rows in parse_rows(args.rows):
+        results = run_size(n_rows, memory=not args.no_memory, repeat=args.repeat,
+                           data=args.data)
+        run['sizes'][str(n_rows)] = results
+        print_results(n_rows, results)
+
+    history = load_history(args.history)
+    slower = regressions(run, history, args.threshold, args.window)
+    if not args.no_save:
+        save_history(history + [run], args.history)
+        print(f"\nSaved to {args.history} ({len(history) + 1} runs)")
+
+    if slower:
+        print(f"\nREGRESSIONS (more than {args.threshold:.0%} slower than the best of the last "
+              f"{args.window} runs):")
+        for n_rows, name, seconds, best in slower:
+            print(f"  {int(n_rows):,} rows, {name}: {seconds:.3f}s vs {best:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# Binary cache for intermediate DataFrames
+# Re-parsing a CSV on every run is slow, and CSV loses the column types
+# (categories like AgeGroup come back as plain strings). Here we store frames
+# in Parquet instead, named after:
+#   - a hash of the source file's contents (new data -> new entry)
+#   - a version of the code that built the frame (new code -> new entry)
+# Old entries for the same name are deleted when a new one is written.
+#
+# Parquet needs pyarrow; without it we fall back to pandas pickles.
+import glob
+import hashlib
+import inspect
+import os
+
+import pandas as pd
+
+CACHE_DIR = '.cache'
+
+# Hashes already computed in this process, keyed by (path, size, modified time)
+_file_hashes = {}
+
+
+def cache_format():
+    # Checked when first needed, so importing this module stays cheap
+    try:
+        import pyarrow  # noqa: F401
+        return 'parquet'
+    except ImportError:
+        return 'pkl'
+
+
+def file_hash(path, block_size=1 << 20):
+    # Hash the file in 1 MB blocks so big files never sit in memory
+    info = os.stat(path)
+    key = (os.path.abspath(path), info.st_size, info.st_mtime_ns)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def code_version(*objects):
+    # Hash of the source code of functions / modules that build a frame
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(name, source, version, cache_dir=CACHE_DIR):
+    key = hashlib.sha256(f"{file_hash(source)}:{version}".encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{name}-{key}.{cache_format()}")
+
+
+def load_frame(name, source, version, cache_dir=CACHE_DIR):
+    # Returns None when there is no up-to-date entry
+    path = cache_path(name, source, version, cache_dir)
+    if not os.path.exists(path):
+        return None
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def save_frame(df, name, source, version, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_path(name, source, version, cache_dir)
+
+    # Remove stale entries for this name (older data or older code)
+    for old in glob.glob(os.path.join(cache_dir, f"{name}-*")):
+        if old != path:
+            os.remove(old)
+
+    # Write to a temp file first so a crash never leaves half a cache entry
+    temp_path = path + '.tmp'
+    if path.endswith('.parquet'):
+        df.to_parquet(temp_path)
+    else:
+        df.to_pickle(temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def cached_frame(name, source, version, build, cache_dir=CACHE_DIR):
+    # Load the cached frame, or build it with build() and cache it
+    df = load_frame(name, source, version, cache_dir)
+    if df is None:
+        df = build()
+        save_frame(df, name, source, version, cache_dir)
+    return df
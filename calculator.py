@@ -1,40 +1,97 @@
 # Simple Calculator - Day 1 of AI Journey
-def add(a, b):
-    return a + b
-
-def subtract(a, b):
-    return a - b
-
-def multiply(a, b):
-    return a * b
-
-def divide(a, b):
-    if b == 0:
-        return "Error: Division by zero"
-    return a / b
-
-# Test the calculator
-print("Calculator Test:")
-print(f"5 + 3 = {add(5, 3)}")
-print(f"10 - 4 = {subtract(10, 4)}")
-print(f"6 * 7 = {multiply(6, 7)}")
-print(f"20 / 4 = {divide(20, 4)}")
-
-# Interactive mode
-print("\n--- Interactive Calculator ---")
-num1 = float(input("Enter first number: "))
-operation = input("Enter operation (+, -, *, /): ")
-num2 = float(input("Enter second number: "))
-
-if operation == '+':
-    result = add(num1, num2)
-elif operation == '-':
-    result = subtract(num1, num2)
-elif operation == '*':
-    result = multiply(num1, num2)
-elif operation == '/':
-    result = divide(num1, num2)
-else:
-    result = "Invalid operation"
-
-print(f"Result: {result}")
\ No newline at end of file
+# The four operations work on plain numbers (interactive mode) and on whole NumPy
+# arrays / pandas Series at once, with the usual broadcasting. Pass out= (an
+# array of the result's shape) to write the result there instead of allocating.
+import sys
+
+import numpy as np
+
+ZERO_DIVISION_MESSAGE = "Error: Division by zero"
+
+
+def is_scalar(a, b, out):
+    return out is None and np.isscalar(a) and np.isscalar(b)
+
+
+def add(a, b, out=None):
+    if is_scalar(a, b, out):
+        return a + b
+    return np.add(a, b, out=out)
+
+def subtract(a, b, out=None):
+    if is_scalar(a, b, out):
+        return a - b
+    return np.subtract(a, b, out=out)
+
+def multiply(a, b, out=None):
+    if is_scalar(a, b, out):
+        return a * b
+    return np.multiply(a, b, out=out)
+
+def divide(a, b, on_zero='message', out=None):
+    # on_zero says what x / 0 gives:
+    #   'message' -> the error text for plain numbers (NaN inside arrays)
+    #   'raise'   -> ZeroDivisionError
+    #   'nan'     -> NaN
+    #   a number  -> that number
+    if is_scalar(a, b, out):
+        if b == 0:
+            if on_zero == 'raise':
+                raise ZeroDivisionError("division by zero")
+            if on_zero == 'message':
+                return ZERO_DIVISION_MESSAGE
+            return float('nan') if on_zero == 'nan' else on_zero
+        return a / b
+
+    zero = np.asarray(b) == 0
+    if on_zero == 'raise' and zero.any():
+        raise ZeroDivisionError(f"division by zero in {int(zero.sum())} values")
+    fill = np.nan if on_zero in ('message', 'nan') else on_zero
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.divide(a, b, out=out)
+    if out is not None:
+        np.copyto(out, fill, where=zero)
+        return out
+    if zero.any():
+        zero = np.broadcast_to(zero, result.shape)
+        # pandas results (Series / DataFrame) can't be assigned through a mask of
+        # positions; checking for .where saves importing pandas just for this
+        if hasattr(result, 'where'):
+            result = result.where(~zero, fill)
+        else:
+            result[zero] = fill
+    return result
+
+OPERATIONS = {'+': add, '-': subtract, '*': multiply, '/': divide}
+
+
+def main():
+    # Expression mode: python calculator.py "Fare / (SibSp + Parch + 1)" [--data train.csv]
+    if len(sys.argv) > 1:
+        from expressions import main as expression_main  # expressions imports this module
+        expression_main(sys.argv[1:])
+        return
+
+    # Test the calculator
+    print("Calculator Test:")
+    print(f"5 + 3 = {add(5, 3)}")
+    print(f"10 - 4 = {subtract(10, 4)}")
+    print(f"6 * 7 = {multiply(6, 7)}")
+    print(f"20 / 4 = {divide(20, 4)}")
+
+    # Interactive mode
+    print("\n--- Interactive Calculator ---")
+    num1 = float(input("Enter first number: "))
+    operation = input("Enter operation (+, -, *, /): ")
+    num2 = float(input("Enter second number: "))
+
+    if operation in OPERATIONS:
+        result = OPERATIONS[operation](num1, num2)
+    else:
+        result = "Invalid operation"
+
+    print(f"Result: {result}")
+
+
+if __name__ == '__main__':
+    main()
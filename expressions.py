@@ -0,0 +1,155 @@
+# Expression mode for the calculator: derived columns from arithmetic on other columns
+#   compile_expression("Fare / (SibSp + Parch + 1)").evaluate(df)
+#
+# The text is parsed once (Python's own parser, ast), parts that are only numbers
+# are worked out straight away ("2 * 3 + Age" -> "6 + Age"), and the rest becomes a
+# short list of steps that call the calculator functions with out= buffers.
+# Rows are evaluated in chunks, so the in-between results are small reused
+# buffers instead of full-length temporary arrays (the way numexpr works).
+# Compiled expressions are cached by their text, so evaluating the same
+# expression again skips all of that.
+#
+# python expressions.py "Fare / (SibSp + Parch + 1)" --data train.csv
+import argparse
+import ast
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from calculator import add, divide, multiply, subtract
+
+# Rows per chunk: a few float64 buffers of this size stay in the CPU cache
+CHUNK_ROWS = 1 << 16
+
+OPERATORS = {
+    ast.Add: add,
+    ast.Sub: subtract,
+    ast.Mult: multiply,
+    ast.Div: divide,
+}
+
+
+class Expression:
+
+    def __init__(self, source, on_zero='nan'):
+        self.source = source
+        # 'message' makes no sense for columns, it means NaN there (see calculator.divide)
+        self.on_zero = 'nan' if on_zero == 'message' else on_zero
+        self.columns = []
+        self.steps = []
+        self.registers = 0
+        self.free = []
+        tree = ast.parse(source, mode='eval')
+        self.result = self.emit(self.fold(tree.body))
+
+    def apply(self, operator, a, b, out=None):
+        if operator is divide:
+            return divide(a, b, self.on_zero, out=out)
+        return operator(a, b, out=out)
+
+    def fold(self, node):
+        # Check the syntax and replace constant-only parts with their value
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return node
+        if isinstance(node, ast.Name):
+            return node
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self.fold(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if isinstance(operand, ast.Constant):
+                return ast.Constant(-operand.value)
+            # -x is compiled as 0 - x
+            return ast.BinOp(ast.Constant(0), ast.Sub(), operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+            left = self.fold(node.left)
+            right = self.fold(node.right)
+            if isinstance(left, ast.Constant) and isinstance(right, ast.Constant):
+                return ast.Constant(self.apply(OPERATORS[type(node.op)], left.value, right.value))
+            return ast.BinOp(left, node.op, right)
+        raise ValueError(f"Unsupported syntax in expression {self.source!r}: {ast.dump(node)}")
+
+    def emit(self, node):
+        # Turn the folded tree into steps: (operator, register, left, right)
+        # An operand is ('const', value), ('column', name) or ('register', number)
+        if isinstance(node, ast.Constant):
+            return ('const', node.value)
+        if isinstance(node, ast.Name):
+            if node.id not in self.columns:
+                self.columns.append(node.id)
+            return ('column', node.id)
+        left = self.emit(node.left)
+        right = self.emit(node.right)
+        # A register can be reused as soon as the step that reads it is done
+        for operand in (left, right):
+            if operand[0] == 'register':
+                self.free.append(operand[1])
+        if self.free:
+            register = self.free.pop()
+        else:
+            register = self.registers
+            self.registers += 1
+        self.steps.append((OPERATORS[type(node.op)], register, left, right))
+        return ('register', register)
+
+    def evaluate(self, data, chunk_rows=CHUNK_ROWS):
+        # data: DataFrame or dict of arrays; returns float64 values (a Series for a DataFrame)
+        arrays = {name: np.asarray(data[name], dtype=np.float64) for name in self.columns}
+        n_rows = len(data[self.columns[0]]) if self.columns else len(data)
+        result = np.empty(n_rows)
+
+        kind, value = self.result
+        if kind == 'const':
+            result[:] = value
+        elif kind == 'column':
+            result[:] = arrays[value]
+        else:
+            scratch = [np.empty(min(chunk_rows, n_rows)) for _ in range(self.registers)]
+            for start in range(0, n_rows, chunk_rows):
+                stop = min(start + chunk_rows, n_rows)
+                size = stop - start
+                registers = [buffer[:size] for buffer in scratch]
+                # The last step writes straight into the result
+                registers[value] = result[start:stop]
+
+                def read(operand):
+                    if operand[0] == 'const':
+                        return operand[1]
+                    if operand[0] == 'column':
+                        return arrays[operand[1]][start:stop]
+                    return registers[operand[1]]
+
+                for operator, register, left, right in self.steps:
+                    self.apply(operator, read(left), read(right), out=registers[register])
+
+        if isinstance(data, pd.DataFrame):
+            return pd.Series(result, index=data.index, name=self.source)
+        return result
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source, on_zero='nan'):
+    return Expression(source, on_zero)
+
+
+def evaluate(source, data, on_zero='nan'):
+    return compile_expression(source, on_zero).evaluate(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Evaluate an arithmetic expression over CSV columns')
+    parser.add_argument('expression', help='e.g. "Fare / (SibSp + Parch + 1)"')
+    parser.add_argument('--data', default='train.csv')
+    parser.add_argument('--on-zero', default='nan', help="x / 0 gives: nan, raise or a number")
+    args = parser.parse_args(argv)
+
+    on_zero = args.on_zero
+    if on_zero not in ('nan', 'raise'):
+        on_zero = float(on_zero)
+    values = evaluate(args.expression, pd.read_csv(args.data), on_zero)
+    print(values.describe())
+
+
+if __name__ == '__main__':
+    main()
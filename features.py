@@ -0,0 +1,174 @@
+# Feature engineering for the Titanic data
+# The same features are used by day4_titanic_analysis.py, day4_advanced_pandas.py
+# and the streaming reports, so they live here once.
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import titanic_data
+from cache import cached_frame, code_version
+from profiling import profiled
+
+AGE_BINS = [0, 12, 18, 35, 60, 100]
+AGE_LABELS = ['Child', 'Teen', 'Young Adult', 'Adult', 'Senior']
+FARE_BINS = [0, 10, 30, 100, 600]
+FARE_LABELS = ['Budget', 'Standard', 'Premium', 'Luxury']
+
+TITLE_MAPPING = {
+    'Mr': 'Mr',
+    'Miss': 'Miss',
+    'Mrs': 'Mrs',
+    'Master': 'Master',
+    'Dr': 'Rare',
+    'Rev': 'Rare',
+    'Col': 'Rare',
+    'Major': 'Rare',
+    'Mlle': 'Miss',
+    'Mme': 'Mrs',
+    'Don': 'Rare',
+    'Dona': 'Rare',
+    'Lady': 'Rare',
+    'Countess': 'Rare',
+    'Jonkheer': 'Rare',
+    'Sir': 'Rare',
+    'Capt': 'Rare',
+    'Ms': 'Miss'
+}
+
+# Columns saved to titanic_cleaned.csv / titanic_enriched.csv
+CLEANED_COLUMNS = ['PassengerId', 'Survived', 'Pclass', 'Sex', 'Age', 'Fare',
+                   'FamilySize', 'AgeGroup']
+ENRICHED_COLUMNS = ['PassengerId', 'Survived', 'Pclass', 'Sex', 'Age_Filled',
+                    'Fare', 'Embarked_Filled', 'Title_Simple', 'IsAlone',
+                    'FareCategory']
+
+
+def age_groups(age):
+    return pd.cut(age, bins=AGE_BINS, labels=AGE_LABELS)
+
+
+def fare_categories(fare):
+    return pd.cut(fare, bins=FARE_BINS, labels=FARE_LABELS)
+
+
+def family_size(df):
+    return df['SibSp'] + df['Parch'] + 1
+
+
+def is_alone(df):
+    return ((df['SibSp'] + df['Parch']) == 0).astype(int)
+
+
+# The title is the word right before a '.', e.g. "Braund, Mr. Owen Harris" -> Mr
+TITLE_PATTERN = re.compile(r' ([A-Za-z]+)\.')
+NAME_PARTS = ['Title', 'Title_Simple', 'FirstName', 'Surname']
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_name(name):
+    # Title, simple title, first name and surname from one name, in one go.
+    # Cached: the same names show up again and again across manifests.
+    match = TITLE_PATTERN.search(name)
+    title = match.group(1) if match else None
+
+    # "Surname, Title. First Other (Maiden)" - same steps as the old
+    # .str.split(',').str[1].str.split('.').str[1].str.strip().str.split().str[0]
+    pieces = name.split(',')
+    first_name = None
+    if len(pieces) > 1:
+        after_title = pieces[1].split('.')
+        if len(after_title) > 1:
+            words = after_title[1].split()
+            if words:
+                first_name = words[0]
+    return title, TITLE_MAPPING.get(title), first_name, pieces[0].strip()
+
+
+def spread_to_rows(per_unique, codes):
+    # Values computed once per distinct string -> a categorical over all rows.
+    # Categories keep first-seen order, so value_counts() ties come out as before.
+    categorical = pd.Categorical(per_unique, categories=pd.unique(
+        pd.Series(per_unique, dtype=object).dropna()))
+    # A trailing -1 so that missing rows (code -1) pick it up, and so that the take
+    # still works when there are no distinct values at all
+    row_codes = np.append(categorical.codes, -1).take(codes)
+    return pd.Categorical.from_codes(row_codes, categorical.categories)
+
+
+@profiled('title_parse')
+def name_features(names):
+    # Parse each distinct name once, then fan the results out by group code
+    codes, uniques = pd.factorize(names)
+    parsed = [parse_name(name) for name in uniques]
+    columns = list(zip(*parsed)) if parsed else [[] for _ in NAME_PARTS]
+    return pd.DataFrame({part: spread_to_rows(list(values), codes)
+                         for part, values in zip(NAME_PARTS, columns)},
+                        index=names.index)
+
+
+def titles(names):
+    return name_features(names)['Title']
+
+
+def simple_titles(title):
+    return title.map(TITLE_MAPPING)
+
+
+def decks(cabin):
+    # First letter of each distinct cabin, as a category
+    codes, uniques = pd.factorize(cabin)
+    return pd.Series(spread_to_rows([value[:1] or None for value in uniques], codes),
+                     index=cabin.index, name='Deck')
+
+
+def with_columns(df, columns):
+    # df plus some derived columns, leaving df itself alone. A shallow copy shares
+    # the existing column data instead of duplicating the whole frame.
+    result = df.copy(deep=False)
+    for name, values in columns.items():
+        result[name] = values
+    return result
+
+
+def cleaned_columns(df):
+    return {'FamilySize': family_size(df), 'AgeGroup': age_groups(df['Age'])}
+
+
+def enriched_columns(df):
+    return {
+        'FareCategory': fare_categories(df['Fare']),
+        'Age_Filled': df['Age'].fillna(df['Age'].median()),
+        'Embarked_Filled': df['Embarked'].fillna(df['Embarked'].mode()[0]),
+        'Title_Simple': name_features(df['Name'])['Title_Simple'],
+        'IsAlone': is_alone(df),
+    }
+
+
+def build_cleaned(df):
+    # The titanic_cleaned.csv frame, from a freshly loaded train.csv
+    return with_columns(df, cleaned_columns(df))[CLEANED_COLUMNS]
+
+
+def build_enriched(df):
+    # The titanic_enriched.csv frame, from a freshly loaded train.csv
+    return with_columns(df, enriched_columns(df))[ENRICHED_COLUMNS]
+
+
+def feature_version():
+    # Cache entries are tied to this file and the loader's schema
+    return code_version(sys.modules[__name__], titanic_data)
+
+
+def cleaned_frame(source='train.csv', build=None):
+    # Cached titanic_cleaned frame; rebuilt only when train.csv or the code changes.
+    # Scripts that already have the columns pass build= to store theirs on a miss
+    return cached_frame('titanic_cleaned', source, feature_version(),
+                        build or (lambda: build_cleaned(titanic_data.load_titanic(source))))
+
+
+def enriched_frame(source='train.csv', build=None):
+    return cached_frame('titanic_enriched', source, feature_version(),
+                        build or (lambda: build_enriched(titanic_data.load_titanic(source))))
@@ -1,4 +1,9 @@
-numbers = [1,2,3,2,4,5,3,6,7,5,1]
+import numpy as np
+import pandas as pd
+
+from sketches import BloomFilter
+
+
 def find_duplicates(numbers):
     counts={}
     for number in numbers:
@@ -6,5 +11,122 @@ def find_duplicates(numbers):
     duplicates = [number for number, count in counts.items() if count>1]
     return duplicates
 
-results = find_duplicates(numbers)
-print(results)
\ No newline at end of file
+
+#NumPy path: same result (and order) as find_duplicates, for data that's already an array
+def find_duplicates_array(values):
+    values = np.asarray(values)
+    #np.unique sorts, so remember where each value first showed up to restore that order
+    uniques, first, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first[counts > 1], kind='stable')
+    return uniques[counts > 1][order]
+
+
+#DataFrame path: key columns that appear in more than one row (first row of each, in order)
+def find_duplicate_rows(df, columns=None):
+    keys = df if columns is None else df[columns]
+    repeated = keys.duplicated(keep=False)
+    first = ~keys.duplicated(keep='first')
+    return keys[repeated & first]
+
+
+def row_keys(df, columns=None):
+    #one 64-bit hash per row, so multi-column keys can go through the streaming path
+    #(two different rows share a hash with probability ~2**-64)
+    keys = df if columns is None else df[columns]
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+class SortedRuns:
+    #a growing set of values kept as a few sorted arrays (with where each value was first seen);
+    #runs of similar size get merged, so adding n values costs O(n log n) overall
+    def __init__(self):
+        self.runs = []
+
+    def lookup(self, values):
+        #first-seen position of each value, -1 if it isn't in the set
+        positions = np.full(len(values), -1, dtype=np.int64)
+        for run_values, run_positions in self.runs:
+            index = np.searchsorted(run_values, values).clip(0, len(run_values) - 1)
+            found = run_values[index] == values
+            positions[found] = run_positions[index[found]]
+        return positions
+
+    def add(self, values, positions):
+        #values must be sorted, distinct and not in the set yet
+        if len(values) == 0:
+            return
+        self.runs.append((values, positions))
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            (values_a, positions_a), (values_b, positions_b) = self.runs.pop(-2), self.runs.pop()
+            values = np.concatenate([values_a, values_b])
+            order = np.argsort(values, kind='stable')
+            self.runs.append((values[order], np.concatenate([positions_a, positions_b])[order]))
+
+
+#streaming path: chunks come in one by one (several manifests, a big file read in pieces)
+def duplicate_batches(chunks):
+    #per chunk: (first-seen positions, values) of the values that just became duplicates
+    seen = SortedRuns()
+    reported = SortedRuns()
+    offset = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        uniques, first, counts = np.unique(chunk, return_index=True, return_counts=True)
+        positions = seen.lookup(uniques)
+        is_new = positions < 0
+        positions[is_new] = first[is_new] + offset
+        seen.add(uniques[is_new], positions[is_new])
+
+        duplicate = ((~is_new) | (counts > 1)) & (reported.lookup(uniques) < 0)
+        if duplicate.any():
+            reported.add(uniques[duplicate], positions[duplicate])
+            order = np.argsort(positions[duplicate], kind='stable')
+            yield positions[duplicate][order], uniques[duplicate][order]
+        offset += len(chunk)
+
+
+def iter_duplicates(chunks):
+    #each duplicate once, as soon as its second copy has been read
+    #(within a chunk, in the order the values were first seen)
+    for _, values in duplicate_batches(chunks):
+        yield from values
+
+
+def find_duplicates_chunked(chunks):
+    #the whole stream's duplicates in first-seen order, like find_duplicates
+    batches = list(duplicate_batches(chunks))
+    if not batches:
+        return np.array([])
+    positions = np.concatenate([batch[0] for batch in batches])
+    values = np.concatenate([batch[1] for batch in batches])
+    return values[np.argsort(positions, kind='stable')]
+
+
+#approximate mode: a Bloom filter remembers what we've seen in fixed memory
+#(it can wrongly say "seen" for about error_rate of new items, never the other way).
+#a second filter remembers what was already reported, so memory stays fixed however
+#many duplicates there are; in return about error_rate of duplicates are never reported
+def iter_duplicates_approx(chunks, capacity=1_000_000, error_rate=0.001):
+    seen = BloomFilter(capacity, error_rate)
+    reported = BloomFilter(capacity, error_rate)
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        again = chunk[seen.seen_before(chunk)]
+        if len(again):
+            yield from again[~reported.seen_before(again)].tolist()
+
+
+def find_duplicates_approx(numbers, capacity=1_000_000, error_rate=0.001, chunk_size=100_000):
+    #duplicates in the order their second copy shows up
+    chunks = (numbers[start:start + chunk_size] for start in range(0, len(numbers), chunk_size))
+    return list(iter_duplicates_approx(chunks, capacity, error_rate))
+
+
+def main():
+    numbers = [1,2,3,2,4,5,3,6,7,5,1]
+    results = find_duplicates(numbers)
+    print(results)
+
+
+if __name__ == '__main__':
+    main()
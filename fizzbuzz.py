@@ -1,13 +1,84 @@
-def fizzbuzz(n):
-    for n in range(1,101):
-        if n%3 == 0 and n % 5 == 0 :
-            print("FizzBuzz")
-        elif n%3 == 0 :
-            print("Fizz")
-        elif n%5 == 0 :
-            print("Buzz")
-        else:
-            print(n)
+# FizzBuzz as a divisibility-rule labeler
+# A rule table (divisor, word) decides the labels: a number gets the words of every
+# rule that divides it, joined together, or just the number if none does.
+#   iter_labels(1, 101)         -> '1', '2', 'Fizz', ... one at a time
+#   bulk_codes(1, 10**8)        -> one small integer per number, made with NumPy
+#   write_labels(f, 1, 10**8)   -> the text, written a chunk at a time
+import sys
+from math import lcm
+
+import numpy as np
+
+RULES = [(3, 'Fizz'), (5, 'Buzz')]
+
+# Above this the repeating pattern is too long to precompute; use one mask per rule
+MAX_PERIOD = 1 << 20
+CHUNK = 1 << 20
+
+
+def label(n, rules=RULES):
+    words = ''.join(word for divisor, word in rules if n % divisor == 0)
+    return words or str(n)
+
+
+def iter_labels(start=1, stop=101, rules=RULES):
+    # Lazily, for any range (stop not included, like range)
+    for n in range(start, stop):
+        yield label(n, rules)
+
+
+def code_words(rules=RULES):
+    # Code -> label for bulk_codes: bit i of the code is set when rule i matches
+    # (code 0 means "no rule", the number itself is the label)
+    words = []
+    for code in range(1 << len(rules)):
+        words.append(''.join(word for i, (_, word) in enumerate(rules) if code >> i & 1))
+    return words
+
+
+def bulk_codes(start=1, stop=101, rules=RULES):
+    # uint8 codes (1 byte per number), so 10**8 numbers take 100 MB
+    dtype = np.uint8 if len(rules) <= 8 else np.uint32
+    count = max(stop - start, 0)
+    period = lcm(*[divisor for divisor, _ in rules])
+    if period <= MAX_PERIOD:
+        # The labels repeat every lcm(divisors) numbers: work out one period and repeat it
+        pattern = codes_by_mask(np.arange(start, start + min(period, count)), rules, dtype)
+        return np.resize(pattern, count)
+    codes = np.empty(count, dtype=dtype)
+    for chunk_start in range(0, count, CHUNK):
+        numbers = np.arange(start + chunk_start, start + min(chunk_start + CHUNK, count))
+        codes[chunk_start:chunk_start + len(numbers)] = codes_by_mask(numbers, rules, dtype)
+    return codes
+
+
+def codes_by_mask(numbers, rules, dtype):
+    codes = np.zeros(len(numbers), dtype=dtype)
+    for i, (divisor, _) in enumerate(rules):
+        codes[numbers % divisor == 0] |= dtype(1 << i)
+    return codes
+
+
+def chunk_text(start, stop, rules=RULES):
+    # One line per number for [start, stop), as a single string
+    codes = bulk_codes(start, stop, rules)
+    words = np.array(code_words(rules), dtype=object)
+    lines = words[codes]
+    plain = np.flatnonzero(codes == 0)
+    lines[plain] = (plain + start).astype(str)
+    return '\n'.join(lines) + '\n' if len(lines) else ''
+
+
+def write_labels(stream, start=1, stop=101, rules=RULES, chunk=CHUNK):
+    # One write per chunk of numbers instead of one print per line
+    for chunk_start in range(start, stop, chunk):
+        stream.write(chunk_text(chunk_start, min(chunk_start + chunk, stop), rules))
+
+
+def fizzbuzz(n, rules=RULES, stream=None):
+    # Labels for 1..n
+    write_labels(stream or sys.stdout, 1, n + 1, rules)
 
 #call the funcion
-fizzbuzz(100)
\ No newline at end of file
+if __name__ == '__main__':
+    fizzbuzz(100)
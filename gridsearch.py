@@ -0,0 +1,272 @@
+# Grid search + cross-validation for the points-based rule models (scoring.py)
+# Picking the points and the threshold of the "Scoring System" was done by hand,
+# looking at one accuracy number on the training set. Here every combination of
+# points (0-3 per condition) and threshold is tried, on k folds.
+#
+# The conditions are yes/no, so a passenger is one of only 2^4 = 16 patterns of
+# conditions, and a candidate's prediction depends on the pattern alone:
+#   1. rows -> (fold, pattern, survived) counts, one np.bincount per shard of rows,
+#      shards spread over a process pool (the only step that touches every row)
+#   2. candidates that predict the same for every pattern found in the data are
+#      merged ("female=2 >= 2" is "female=1 >= 1"), which leaves about a hundred
+#   3. for each fold, (died, survived) counts per pattern @ predictions per pattern
+#      (patterns x candidates) gives every candidate's confusion matrix at once
+#   4. after each fold, candidates that are worse on the folds seen so far in both
+#      true positives and false positives than some other candidate are dropped
+#
+# Pruning is only for the ranking table. Pruning looks at the held-out folds, so the
+# cross-validated estimate of picking the best candidate comes from an unpruned search.
+#
+# python gridsearch.py --folds 5 --top 10
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from metrics import scores
+from parallel import attach, shard_bounds, share
+from preprocessing import Preprocessor
+from scoring import CONDITIONS, MODELS, condition_masks
+from titanic_data import load_titanic
+
+POINTS = [0, 1, 2, 3]
+FOLDS = 5
+
+
+def condition_inputs(df, conditions):
+    # The columns the conditions read, as plain arrays (categories as integer codes)
+    arrays = {}
+    categories = {}
+    for column in sorted({CONDITIONS[name][0] for name in conditions}):
+        series = df[column]
+        if not pd.api.types.is_numeric_dtype(series):
+            codes, uniques = pd.factorize(series)
+            arrays[column] = codes.astype(np.int32)
+            categories[column] = list(uniques)
+        else:
+            arrays[column] = series.to_numpy()
+    return arrays, categories
+
+
+def pattern_codes(masks, conditions):
+    # Condition i true -> bit i set
+    codes = np.zeros(len(masks[conditions[0]]), dtype=np.intp)
+    for bit, name in enumerate(conditions):
+        codes |= masks[name].astype(np.intp) << bit
+    return codes
+
+
+def count_rows(inputs, categories, conditions, folds, survived, n_folds):
+    # (fold, pattern, survived) counts for one block of rows
+    frame = pd.DataFrame({column: pd.Categorical.from_codes(values, categories[column])
+                          if column in categories else values
+                          for column, values in inputs.items()})
+    codes = pattern_codes(condition_masks(frame, conditions), conditions)
+    n_patterns = 1 << len(conditions)
+    keys = (folds.astype(np.intp) * n_patterns + codes) * 2 + survived
+    return np.bincount(keys, minlength=n_folds * n_patterns * 2).reshape(n_folds, n_patterns, 2)
+
+
+def count_shard(input_spec, categories, conditions, n_folds, start, stop):
+    # Runs in a worker process: count rows [start, stop) straight from shared memory
+    blocks, arrays = attach(input_spec)
+    try:
+        shard = {column: values[start:stop] for column, values in arrays.items()}
+        folds = shard.pop('_fold')
+        survived = shard.pop('_survived')
+        return count_rows(shard, categories, conditions, folds, survived, n_folds)
+    finally:
+        del arrays, shard
+        for block in blocks.values():
+            block.close()
+
+
+def fold_ids(n_rows, n_folds=FOLDS, seed=0):
+    # Every row in one fold, folds as equal as possible
+    return (np.random.default_rng(seed).permutation(n_rows) % n_folds).astype(np.int8)
+
+
+def pattern_counts(df, conditions, n_folds=FOLDS, seed=0, workers=None, shards=None):
+    # (folds, patterns, 2) array: died / survived passengers per fold and pattern
+    arrays, categories = condition_inputs(df, conditions)
+    folds = fold_ids(len(df), n_folds, seed)
+    survived = df['Survived'].to_numpy().astype(np.int8)
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return count_rows(arrays, categories, conditions, folds, survived, n_folds)
+
+    arrays['_fold'] = folds
+    arrays['_survived'] = survived
+    blocks, spec = share(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(count_shard, spec, categories, conditions, n_folds, start, stop)
+                    for start, stop in shard_bounds(len(df), shards or workers * 4)]
+            return sum(job.result() for job in jobs)
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+def all_patterns(n_conditions):
+    # Row p, column i: is bit i of p set
+    return (np.arange(1 << n_conditions)[:, None] >> np.arange(n_conditions)) & 1
+
+
+def candidate_grid(conditions, points=POINTS):
+    # Every (points per condition, threshold) combination, simplest first
+    weights = np.array([combo for combo in itertools.product(points, repeat=len(conditions))
+                        if any(combo)])
+    totals = weights.sum(axis=1)
+    rows = np.repeat(np.arange(len(weights)), totals)
+    thresholds = np.concatenate([np.arange(1, total + 1) for total in totals])
+    order = np.lexsort((thresholds, totals[rows]))
+    return weights[rows][order], thresholds[order]
+
+
+def model_candidates(conditions):
+    # The hand-written models from scoring.py as (weights, threshold)
+    weights = np.array([[MODELS[model]['points'].get(name, 0) for name in conditions]
+                        for model in MODELS])
+    thresholds = np.array([MODELS[model]['threshold'] for model in MODELS])
+    return weights, thresholds
+
+
+def decisions(weights, thresholds):
+    # (patterns, candidates) 0/1: would each candidate predict "survived" for each pattern
+    totals = all_patterns(weights.shape[1]) @ weights.T
+    return (totals >= thresholds).astype(np.float64)
+
+
+def distinct(weights, thresholds, present, keep=0):
+    # Positions of the first candidate of every group that makes the same predictions
+    # for the patterns present in the data (and of the first `keep` candidates)
+    _, first = np.unique(decisions(weights, thresholds)[present].T, axis=0, return_index=True)
+    return np.union1d(np.arange(keep), first)
+
+
+def confusion(counts, predicted):
+    # counts (patterns, 2) @ predicted (patterns, candidates) -> (candidates, 4) in metrics.COUNTS order
+    positives = counts.T @ predicted  # died / survived passengers predicted to survive
+    died, survived = counts.sum(axis=0)
+    return np.stack([died - positives[0], positives[0], survived - positives[1], positives[1]],
+                    axis=1).astype(np.int64)
+
+
+def dominated(totals, keep=()):
+    # Candidates another one beats on both tp (higher or equal) and fp (lower or equal)
+    tp = totals[:, 3]
+    fp = totals[:, 1]
+    at_least = (tp[None, :] >= tp[:, None]) & (fp[None, :] <= fp[:, None])
+    better = at_least & ((tp[None, :] > tp[:, None]) | (fp[None, :] < fp[:, None]))
+    result = better.any(axis=1)
+    result[list(keep)] = False
+    return result
+
+
+def search(counts, conditions, points=POINTS, prune=True):
+    # Cross-validated confusion matrices for the whole grid (plus the scoring.py models)
+    grid_weights, grid_thresholds = candidate_grid(conditions, points)
+    model_weights, model_thresholds = model_candidates(conditions)
+    # Models first so they're never merged away (and never pruned)
+    weights = np.concatenate([model_weights, grid_weights])
+    thresholds = np.concatenate([model_thresholds, grid_thresholds])
+    chosen = distinct(weights, thresholds, counts.sum(axis=(0, 2)) > 0, keep=len(MODELS))
+    weights, thresholds = weights[chosen], thresholds[chosen]
+    keep = np.arange(len(MODELS))
+    n_candidates = len(weights)
+
+    alive = np.arange(n_candidates)
+    fold_counts = np.zeros((len(counts), n_candidates, 4), dtype=np.int64)
+    for fold, fold_patterns in enumerate(counts):
+        fold_counts[fold, alive] = confusion(fold_patterns, decisions(weights[alive], thresholds[alive]))
+        if prune and fold < len(counts) - 1:
+            survivors = ~dominated(fold_counts[:fold + 1, alive].sum(axis=0), np.isin(alive, keep).nonzero()[0])
+            alive = alive[survivors]
+    return {
+        'weights': weights[alive],
+        'thresholds': thresholds[alive],
+        'fold_counts': fold_counts[:, alive],
+        'candidates': n_candidates,
+        'grid': len(grid_weights),
+        'models': len(MODELS),
+        'pruned': prune,
+    }
+
+
+def cross_validated(result):
+    # For each fold: pick the best candidate on the other folds, score it on this one.
+    # Needs search(prune=False): pruning has already seen the held-out fold, so picking
+    # among its survivors would make the estimate look better than it is
+    if result['pruned']:
+        raise ValueError("cross_validated needs an unpruned search (prune=False)")
+    fold_counts = result['fold_counts']
+    totals = fold_counts.sum(axis=0)
+    picks = []
+    for fold in range(len(fold_counts)):
+        training = scores(totals - fold_counts[fold])['accuracy']
+        best = int(np.argmax(training))
+        picks.append((best, scores(fold_counts[fold, best])['accuracy']))
+    return picks
+
+
+def describe(weights, threshold, conditions):
+    points = ' '.join(f"{name}={value}" for name, value in zip(conditions, weights) if value)
+    return f"{points} >= {threshold}"
+
+
+def print_report(result, conditions, top=10, unpruned=None):
+    # unpruned: search(prune=False) over the same counts, for the cross-validated
+    # estimate (not needed when result itself is unpruned)
+    unpruned = result if unpruned is None else unpruned
+    fold_counts = result['fold_counts']
+    pooled = scores(fold_counts.sum(axis=0))
+    per_fold = scores(fold_counts)['accuracy']
+    print(f"{result['grid']} grid candidates -> {result['candidates'] - result['models']} with different "
+          f"predictions -> {len(result['thresholds']) - result['models']} left after pruning\n")
+
+    order = np.argsort(-pooled['accuracy'], kind='stable')
+    names = {index: model for index, model in enumerate(MODELS)}
+    shown = list(order[:top]) + [index for index in range(result['models']) if index not in order[:top]]
+    print(f"{'candidate':<48} {'accuracy':>9} {'+/-':>5} {'precision':>9} {'recall':>7}")
+    for index in shown:
+        label = describe(result['weights'][index], result['thresholds'][index], conditions)
+        print(f"{label:<48} {pooled['accuracy'][index] * 100:8.1f}% {per_fold[:, index].std() * 100:5.1f} "
+              f"{pooled['precision'][index]:9.2f} {pooled['recall'][index]:7.2f}  {names.get(index, '')}".rstrip())
+
+    picks = cross_validated(unpruned)
+    mean = np.mean([accuracy for _, accuracy in picks]) * 100
+    print(f"\nCross-validated accuracy of picking the best candidate: {mean:.1f}%")
+    for fold, (index, accuracy) in enumerate(picks):
+        label = describe(unpruned['weights'][index], unpruned['thresholds'][index], conditions)
+        print(f"  fold {fold}: {label:<44} {accuracy * 100:.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Grid search the scoring model points and threshold')
+    parser.add_argument('path', nargs='?', default='train.csv')
+    parser.add_argument('--folds', type=int, default=FOLDS)
+    parser.add_argument('--points', default=','.join(map(str, POINTS)),
+                        help='points a condition can be worth, comma separated')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help='processes for the counting pass (1 = no pool)')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--no-prune', action='store_true', help='keep dominated candidates')
+    args = parser.parse_args(argv)
+
+    df = load_titanic(args.path)
+    df = Preprocessor().fit(df).transform(df)
+    conditions = list(CONDITIONS)
+    counts = pattern_counts(df, conditions, args.folds, args.seed, args.workers)
+    points = [int(value) for value in args.points.split(',')]
+    result = search(counts, conditions, points, prune=not args.no_prune)
+    unpruned = result if args.no_prune else search(counts, conditions, points, prune=False)
+    print_report(result, conditions, args.top, unpruned)
+
+
+if __name__ == '__main__':
+    main()
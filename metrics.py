@@ -0,0 +1,126 @@
+# Confusion matrices and scores for many models at once
+# day4_prediction_model.py counted tp / fp / tn / fn with four boolean-mask sums
+# for one model, and worked out each model's accuracy separately. A row of a
+# model falls in cell 2 * survived + predicted of its confusion matrix
+# (0 = tn, 1 = fp, 2 = fn, 3 = tp), so all four cells follow from three counts:
+# rows, survivors (once for all models), and per model predicted survivors and
+# predicted survivors who survived. np.count_nonzero does each of those in one
+# quick pass; an np.bincount over the packed codes gives the same table but has
+# to widen every code to 64 bits first and is ~7x slower.
+# ConfusionCounts adds the counts up chunk by chunk (like the streaming
+# reports), so evaluating a huge scored file needs memory for the counts only.
+#
+# python metrics.py titanic_predictions.csv
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from streaming import DEFAULT_CHUNKSIZE, read_chunks
+
+COUNTS = ['tn', 'fp', 'fn', 'tp']
+SCORES = ['accuracy', 'precision', 'recall', 'f1']
+
+
+def prediction_rows(predictions):
+    # One 0/1 array per model: a frame has a column per model, an array a row per model
+    if isinstance(predictions, pd.DataFrame):
+        return [predictions[column].to_numpy(dtype=bool) for column in predictions.columns]
+    matrix = np.asarray(predictions)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    return [row.astype(bool, copy=False) for row in matrix]
+
+
+def confusion_matrices(y, predictions):
+    # (models, 4) counts in COUNTS order; y and the predictions are 0/1
+    survived = np.asarray(y).astype(bool, copy=False)
+    rows = len(survived)
+    survivors = np.count_nonzero(survived)
+    models = prediction_rows(predictions)
+    counts = np.empty((len(models), 4), dtype=np.int64)
+    for index, predicted in enumerate(models):
+        tp = np.count_nonzero(predicted & survived)
+        fp = np.count_nonzero(predicted) - tp
+        counts[index] = [rows - survivors - fp, fp, survivors - tp, tp]
+    return counts
+
+
+def scores(counts):
+    # accuracy / precision / recall / F1 from (..., 4) counts; 0 where undefined
+    tn, fp, fn, tp = np.moveaxis(np.asarray(counts, dtype=np.float64), -1, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        precision = np.nan_to_num(tp / (tp + fp))
+        recall = np.nan_to_num(tp / (tp + fn))
+        return {
+            'accuracy': (tp + tn) / (tn + fp + fn + tp),
+            'precision': precision,
+            'recall': recall,
+            'f1': np.nan_to_num(2 * precision * recall / (precision + recall)),
+        }
+
+
+def confusion_table(counts, models):
+    # One row per model: the four counts and the scores
+    table = pd.DataFrame(np.asarray(counts), index=pd.Index(models, name='model'), columns=COUNTS)
+    for name, values in scores(counts).items():
+        table[name] = values
+    return table
+
+
+class ConfusionCounts:
+    # Confusion matrices built up chunk by chunk; O(models) memory
+
+    def __init__(self, models):
+        self.models = list(models)
+        self.counts = np.zeros((len(self.models), 4), dtype=np.int64)
+
+    def update(self, y, predictions):
+        self.counts += confusion_matrices(y, predictions)
+        return self
+
+    def update_frame(self, chunk, target='Survived'):
+        return self.update(chunk[target], chunk[self.models])
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def result(self):
+        return confusion_table(self.counts, self.models)
+
+
+def evaluate(y, predictions):
+    # Table for predictions already in memory (a frame with one column per model)
+    models = list(predictions.columns) if isinstance(predictions, pd.DataFrame) else None
+    counts = confusion_matrices(y, predictions)
+    return confusion_table(counts, models or [f"model_{index}" for index in range(len(counts))])
+
+
+def evaluate_file(path, models=None, target='Survived', chunksize=DEFAULT_CHUNKSIZE):
+    # Stream a scored CSV; models = every Prediction_* column unless given
+    if models is None:
+        header = pd.read_csv(path, nrows=0).columns
+        models = [column for column in header if column.startswith('Prediction_')]
+    counts = ConfusionCounts(models)
+    for chunk in read_chunks(path, chunksize, usecols=[target] + list(models)):
+        counts.update_frame(chunk, target)
+    return counts.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Confusion matrices and scores for a scored CSV')
+    parser.add_argument('path', nargs='?', default='titanic_predictions.csv')
+    parser.add_argument('--models', help='comma separated prediction columns (default: Prediction_*)')
+    parser.add_argument('--target', default='Survived')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    models = args.models.split(',') if args.models else None
+    table = evaluate_file(args.path, models, args.target, args.chunksize)
+    with pd.option_context('display.float_format', '{:.3f}'.format):
+        print(table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+# Parallel feature + scoring pipeline
+# The cleaning, feature and rule-scoring steps only look at one row at a time, so
+# the rows can be split into shards and handled by separate processes.
+#
+# Sending DataFrames to worker processes means pickling them (a full copy each
+# way). Instead the input columns are copied once into shared memory as plain
+# NumPy arrays; each worker reads its slice of rows straight from there and
+# writes its results into shared output arrays at the same positions. Because
+# every shard writes to its own rows, the result is identical to a serial run.
+#
+# Text columns can't go into shared memory as they are. Sex / Embarked are sent as
+# integer codes plus their (small) list of distinct values. Name has about as many
+# distinct values as rows, so parsing the titles up front would leave the workers
+# little to do; instead the raw names go in as one UTF-8 byte buffer plus row
+# offsets into it (Arrow's string layout), and each worker parses its own rows.
+#
+# The fills and 0/1 columns are Preprocessor.transform (preprocessing.py), fitted
+# once on the whole frame and sent to every worker, so they can't drift apart.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from features import TITLE_MAPPING, parse_name
+from preprocessing import Preprocessor
+from scoring import MODELS, predict_all
+
+NUMERIC_INPUTS = ['Pclass', 'Age', 'Fare', 'SibSp', 'Parch']
+CODED_INPUTS = ['Sex', 'Embarked']
+SIMPLE_TITLES = sorted(set(TITLE_MAPPING.values()))
+
+# Everything the workers produce (all small integers)
+PREPARED_OUTPUTS = ['FamilySize', 'IsAlone', 'Sex_Numeric', 'Embarked_S', 'Embarked_C']
+OUTPUTS = PREPARED_OUTPUTS + ['Title_Simple'] + list(MODELS)
+
+
+def name_buffers(names):
+    # Row offsets (n + 1) into one UTF-8 byte array holding every name back to back
+    try:
+        import pyarrow as pa
+    except ImportError:
+        encoded = [name.encode() for name in names.fillna('')]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    array = pa.array(names.fillna(''))
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    array = array.cast(pa.large_string())
+    _, offsets, data = array.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    return offsets, np.frombuffer(data, dtype=np.uint8) if data is not None else np.zeros(0, np.uint8)
+
+
+def column_arrays(df):
+    # Plain NumPy arrays for the shared buffers, and the category lists for the codes
+    arrays = {column: df[column].to_numpy(dtype=np.float64 if column in ('Age', 'Fare') else np.int64)
+              for column in NUMERIC_INPUTS}
+    categories = {}
+    for column in CODED_INPUTS:
+        codes, uniques = pd.factorize(df[column])
+        arrays[column] = codes.astype(np.int32)
+        categories[column] = list(uniques)
+    arrays['Name_Offsets'], arrays['Name_Bytes'] = name_buffers(df['Name'])
+    return arrays, categories
+
+
+def shard_names(offsets, data, start, stop):
+    # Group codes and distinct names for rows [start, stop), read from the byte buffer
+    try:
+        import pyarrow as pa
+    except ImportError:
+        names = [bytes(data[offsets[row]:offsets[row + 1]]).decode() for row in range(start, stop)]
+        codes, uniques = pd.factorize(np.array(names, dtype=object))
+        return codes, list(uniques)
+    names = pa.LargeStringArray.from_buffers(stop - start, pa.py_buffer(offsets), pa.py_buffer(data),
+                                             offset=start)
+    encoded = names.dictionary_encode()
+    return encoded.indices.to_numpy(), encoded.dictionary.to_pylist()
+
+
+def title_codes(codes, names):
+    # Title_Simple code (index into SIMPLE_TITLES, -1 = none) per row, parsing each
+    # distinct name once
+    per_name = []
+    for name in names:
+        simple = parse_name(name)[1]
+        per_name.append(SIMPLE_TITLES.index(simple) if simple is not None else -1)
+    return np.array(per_name, dtype=np.int8).take(codes)
+
+
+def shard_inputs(arrays, start, stop):
+    # Rows [start, stop) of the row-aligned inputs, plus their titles
+    shard = {column: arrays[column][start:stop] for column in NUMERIC_INPUTS + CODED_INPUTS}
+    shard['Title_Simple'] = title_codes(*shard_names(arrays['Name_Offsets'], arrays['Name_Bytes'],
+                                                     start, stop))
+    return shard
+
+
+def process_rows(inputs, categories, preprocessor):
+    # Cleaning -> features -> scores for one block of rows (plain arrays in and out)
+    frame = pd.DataFrame({column: inputs[column] for column in NUMERIC_INPUTS})
+    for column in CODED_INPUTS:
+        # The training values too, so the Embarked fill is always a category
+        values = categories[column] + [value for value in preprocessor.categories[column]
+                                       if value not in categories[column]]
+        frame[column] = pd.Categorical.from_codes(inputs[column], values)
+    frame = preprocessor.transform(frame)
+
+    outputs = {column: frame[column].to_numpy() for column in PREPARED_OUTPUTS}
+    outputs['Title_Simple'] = inputs['Title_Simple']
+    predictions = predict_all(frame)
+    for model in MODELS:
+        outputs[model] = predictions[model].to_numpy()
+    return outputs
+
+
+def attach(spec):
+    # Open the shared buffers by name and view them as NumPy arrays (no copy)
+    blocks = {}
+    arrays = {}
+    for column, (name, dtype, length) in spec.items():
+        blocks[column] = shared_memory.SharedMemory(name=name)
+        arrays[column] = np.ndarray((length,), dtype=dtype, buffer=blocks[column].buf)
+    return blocks, arrays
+
+
+def run_shard(input_spec, output_spec, categories, preprocessor, start, stop):
+    # Runs in a worker process: read rows [start, stop), write results in place
+    in_blocks, inputs = attach(input_spec)
+    out_blocks, outputs = attach(output_spec)
+    try:
+        shard = shard_inputs(inputs, start, stop)
+        for column, values in process_rows(shard, categories, preprocessor).items():
+            outputs[column][start:stop] = values
+    finally:
+        del inputs, outputs, shard
+        for block in list(in_blocks.values()) + list(out_blocks.values()):
+            block.close()
+    return stop - start
+
+
+def share(arrays):
+    # Copy each array into a new shared memory block
+    blocks = {}
+    spec = {}
+    for column, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks[column] = block
+        spec[column] = (block.name, array.dtype.str, len(array))
+    return blocks, spec
+
+
+def shard_bounds(n_rows, shards):
+    edges = np.linspace(0, n_rows, shards + 1).astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+
+def to_frame(outputs, index):
+    result = pd.DataFrame({column: outputs[column] for column in OUTPUTS}, index=index)
+    result['Title_Simple'] = pd.Categorical.from_codes(result['Title_Simple'], SIMPLE_TITLES)
+    return result
+
+
+def run_serial(df, preprocessor=None):
+    # Same stages in this process, for comparison and small inputs
+    preprocessor = Preprocessor().fit(df) if preprocessor is None else preprocessor
+    arrays, categories = column_arrays(df)
+    outputs = process_rows(shard_inputs(arrays, 0, len(df)), categories, preprocessor)
+    return to_frame({column: np.asarray(values).astype(np.int8) for column, values in outputs.items()},
+                    df.index)
+
+
+def run_parallel(df, workers=None, shards=None, preprocessor=None):
+    workers = workers or os.cpu_count()
+    shards = shards or workers * 4
+    # Fill values are global statistics, so they're learned once up front
+    preprocessor = Preprocessor().fit(df) if preprocessor is None else preprocessor
+
+    arrays, categories = column_arrays(df)
+    input_blocks, input_spec = share(arrays)
+    output_blocks, output_spec = share({column: np.zeros(len(df), dtype=np.int8)
+                                        for column in OUTPUTS})
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(run_shard, input_spec, output_spec, categories, preprocessor, start, stop)
+                    for start, stop in shard_bounds(len(df), shards)]
+            for job in jobs:
+                job.result()
+        outputs = {column: np.ndarray((len(df),), dtype=np.int8, buffer=block.buf).copy()
+                   for column, block in output_blocks.items()}
+        return to_frame(outputs, df.index)
+    finally:
+        for block in list(input_blocks.values()) + list(output_blocks.values()):
+            block.close()
+            block.unlink()
@@ -0,0 +1,171 @@
+# Titanic prediction pipeline: load -> prepare -> score -> save
+# Each stage is a plain function, so other code can import and reuse them.
+# Importing this module doesn't read or write any files.
+#
+# From the command line every stage's result is cached (see cache.py). A stage is
+# skipped when its cached result is still valid for the current train.csv and
+# stage code, and the run prints how long each stage took.
+#
+# python pipeline.py                     # everything, skipping what's up to date
+# python pipeline.py --stages load,prepare # stop after the fills and features
+# python pipeline.py --force             # ignore the cache
+import argparse
+import json
+import os
+import time
+
+import features
+import preprocessing
+import scoring
+import sketches
+import titanic_data
+from profiling import stage
+from cache import CACHE_DIR, cache_path, code_version, load_frame, save_frame
+from preprocessing import Preprocessor
+from scoring import MODELS, predict_all
+from titanic_data import load_titanic
+
+PREDICTION_COLUMNS = ['PassengerId', 'Name', 'Survived'] + list(MODELS)
+
+
+def load(source='train.csv'):
+    return load_titanic(source)
+
+
+def prepare(df):
+    # Fills, 0/1 columns, family features and bins learned from this frame (preprocessing.py)
+    return Preprocessor().fit(df).transform(df)
+
+
+def score(df):
+    predictions = predict_all(df)
+    for model in MODELS:
+        df[model] = predictions[model]
+    return df
+
+
+def save(df, output='titanic_predictions.csv'):
+    df[PREDICTION_COLUMNS].to_csv(output, index=False)
+    return df
+
+
+# Stage name -> function that takes the previous stage's frame
+STAGES = {
+    'prepare': prepare,
+    'score': score,
+}
+STAGE_NAMES = ['load'] + list(STAGES) + ['save']
+# The modules each stage's result also depends on: the schema, the Preprocessor
+# (with the bins it takes from features.py and the fills from sketches.py), the rules
+STAGE_MODULES = {
+    'load': [titanic_data],
+    'prepare': [preprocessing, features, sketches],
+    'score': [scoring],
+}
+
+
+def stage_version(name):
+    # A stage's result depends on its own code and every stage before it
+    upto = STAGE_NAMES.index(name)
+    functions = [load] + list(STAGES.values())
+    code = functions[:upto + 1]
+    for stage_name in STAGE_NAMES[:upto + 1]:
+        code.extend(STAGE_MODULES.get(stage_name, []))
+    return code_version(*code)
+
+
+def cache_name(stage):
+    return f"pipeline_{stage}"
+
+
+def output_is_current(source, output, cache_dir=CACHE_DIR):
+    # The save stage is up to date if the output file was written from this exact input
+    stamp = os.path.join(cache_dir, os.path.basename(output) + '.stamp')
+    if not (os.path.exists(output) and os.path.exists(stamp)):
+        return False
+    with open(stamp) as f:
+        return f.read() == cache_path(cache_name('score'), source, stage_version('score'), cache_dir)
+
+
+def write_stamp(source, output, cache_dir=CACHE_DIR):
+    stamp = os.path.join(cache_dir, os.path.basename(output) + '.stamp')
+    with open(stamp, 'w') as f:
+        f.write(cache_path(cache_name('score'), source, stage_version('score'), cache_dir))
+
+
+def run(stages=None, source='train.csv', output='titanic_predictions.csv',
+        force=False, cache_dir=CACHE_DIR):
+    # Run the pipeline up to the last selected stage; returns (frame, timings)
+    stages = STAGE_NAMES if stages is None else stages
+    last = max(STAGE_NAMES.index(stage) for stage in stages)
+    needed = STAGE_NAMES[:last + 1]
+    timings = []
+
+    if 'save' in needed and not force and output_is_current(source, output, cache_dir):
+        timings.append({'stage': 'save', 'status': 'up to date', 'seconds': 0.0})
+        return None, timings
+
+    # Start from the latest stage that still has a valid cached result
+    df = None
+    start = 0
+    if not force:
+        for index in range(min(last, len(STAGE_NAMES) - 2), -1, -1):
+            name = STAGE_NAMES[index]
+            began = time.perf_counter()
+            df = load_frame(cache_name(name), source, stage_version(name), cache_dir)
+            if df is not None:
+                timings.append({'stage': name, 'status': 'cached',
+                                'seconds': time.perf_counter() - began})
+                start = index + 1
+                break
+
+    for name in needed[start:]:
+        began = time.perf_counter()
+        with stage(name) as timing:
+            if name == 'load':
+                df = load(source)
+            elif name == 'save':
+                save(df, output)
+                os.makedirs(cache_dir, exist_ok=True)
+                write_stamp(source, output, cache_dir)
+            else:
+                df = STAGES[name](df)
+            timing.rows = len(df)
+        if name != 'save':
+            with stage('cache_write'):
+                save_frame(df, cache_name(name), source, stage_version(name), cache_dir)
+        timings.append({'stage': name, 'status': 'ran', 'seconds': time.perf_counter() - began})
+    return df, timings
+
+
+def print_timings(timings):
+    for timing in timings:
+        print(f"{timing['stage']:<10} {timing['status']:<11} {timing['seconds'] * 1000:8.1f} ms")
+    total = sum(timing['seconds'] for timing in timings)
+    print(f"{'total':<10} {'':<11} {total * 1000:8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Titanic prediction pipeline')
+    parser.add_argument('--source', default='train.csv')
+    parser.add_argument('--output', default='titanic_predictions.csv')
+    parser.add_argument('--stages', default=','.join(STAGE_NAMES),
+                        help=f"comma separated, from: {', '.join(STAGE_NAMES)}")
+    parser.add_argument('--force', action='store_true', help='ignore cached stage results')
+    parser.add_argument('--json', action='store_true', help='print timings as JSON')
+    args = parser.parse_args(argv)
+
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGE_NAMES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    _, timings = run(stages, args.source, args.output, args.force)
+    if args.json:
+        print(json.dumps(timings, indent=2))
+    else:
+        print_timings(timings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# Fit once, transform many: the Titanic preprocessing as a small saved state
+# day4_prediction_model.py used to work out the Age / Fare medians and the most
+# common port from whatever frame it was given, and rebuild the 0/1 columns each
+# time. Here everything learned from the training data is kept in a Preprocessor:
+#   - fills: Age / Fare median, most common Embarked port
+#   - categories: the Sex / Embarked values seen in training (for the 0/1 columns)
+#   - bins: the pd.cut edges and labels of AgeGroup / FareCategory (features.py)
+#   - source / code: hashes of the training file and of the code that fits the state
+#     (this file, the bins in features.py, the fills in sketches.py), so a saved
+#     state is refitted when either changes
+# It saves to a few hundred bytes of JSON. transform() then only does column
+# operations on the new rows, so test.csv or a chunk of a big file is prepared
+# exactly like train.csv without reading train.csv again.
+#
+# python preprocessing.py fit train.csv --state .cache/preprocessor.json
+# python preprocessing.py score test.csv --output titanic_test_predictions.csv
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import features
+import sketches
+from cache import CACHE_DIR, code_version, file_hash
+from features import AGE_BINS, AGE_LABELS, FARE_BINS, FARE_LABELS
+from profiling import profiled
+from scoring import MODELS, predict_all
+from sketches import exact_fill_values, sketch_fill_values
+from streaming import DEFAULT_CHUNKSIZE, read_chunks
+from titanic_data import load_titanic, titanic_dtypes
+
+STATE_VERSION = 1
+DEFAULT_STATE = os.path.join(CACHE_DIR, 'preprocessor.json')
+# The model inputs transform() produces (features_to_use in day4_prediction_model.py)
+FEATURES = ['Pclass', 'Sex_Numeric', 'Age', 'Fare', 'FamilySize', 'IsAlone', 'Embarked_S', 'Embarked_C']
+CATEGORY_COLUMNS = ['Sex', 'Embarked']
+# 0/1 column -> (column, value that counts as 1)
+INDICATORS = {
+    'Sex_Numeric': ('Sex', 'female'),
+    'Embarked_S': ('Embarked', 'S'),
+    'Embarked_C': ('Embarked', 'C'),
+}
+# Binned column -> (column, edges, labels); bins include their right edge like pd.cut
+BINS = {
+    'AgeGroup': ('Age', AGE_BINS, AGE_LABELS),
+    'FareCategory': ('Fare', FARE_BINS, FARE_LABELS),
+}
+
+
+def state_code_version():
+    return code_version(sys.modules[__name__], features, sketches)
+
+
+def bin_codes(values, edges):
+    # pd.cut's codes without pd.cut: (edges[i], edges[i + 1]] -> i, outside or NaN -> -1
+    # Counting the edges below each value is one comparison per edge, which for a
+    # handful of edges is a few times faster than np.searchsorted's binary search
+    above = np.zeros(len(values), dtype=np.int8)
+    for edge in edges:
+        above += values > edge
+    return np.where(above == len(edges), -1, above - 1)
+
+
+class Preprocessor:
+
+    def __init__(self, fills=None, categories=None, bins=None, source=None, code=None):
+        self.fills = fills
+        self.categories = categories
+        self.bins = {name: (column, list(edges), list(labels))
+                     for name, (column, edges, labels) in (bins or BINS).items()}
+        # cache.file_hash of the file it was fitted on (None for an in-memory frame)
+        self.source = source
+        # state_code_version() of the code that fitted it
+        self.code = code
+
+    def fit(self, df):
+        # Learn from a whole frame
+        self.source = None
+        self.code = state_code_version()
+        self.fills = exact_fill_values(df)
+        self.categories = {column: sorted(str(value) for value in df[column].dropna().unique())
+                           for column in CATEGORY_COLUMNS}
+        return self
+
+    def fit_chunks(self, chunks, error=0.01):
+        # Learn from one pass over chunks of a file too big for memory (approximate medians)
+        self.source = None
+        self.code = state_code_version()
+        seen = {column: set() for column in CATEGORY_COLUMNS}
+
+        def observed(chunks):
+            for chunk in chunks:
+                for column, values in seen.items():
+                    values.update(str(value) for value in chunk[column].dropna().unique())
+                yield chunk
+
+        self.fills = sketch_fill_values(observed(chunks), error)
+        self.categories = {column: sorted(values) for column, values in seen.items()}
+        return self
+
+    @profiled('preprocess')
+    def transform(self, df):
+        # Fill, encode and bin the new rows in place; returns df
+        if self.fills is None:
+            raise ValueError('Preprocessor is not fitted yet')
+        for column in ['Age', 'Embarked', 'Fare']:
+            df[column] = df[column].fillna(self.fills[column])
+
+        codes = {column: pd.Categorical(df[column], categories=categories).codes
+                 for column, categories in self.categories.items()}
+        for name, (column, value) in INDICATORS.items():
+            categories = self.categories[column]
+            code = categories.index(value) if value in categories else -2
+            df[name] = (codes[column] == code).astype(int)
+
+        df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
+        df['IsAlone'] = (df['FamilySize'] == 1).astype(int)
+
+        for name, (column, edges, labels) in self.bins.items():
+            df[name] = pd.Categorical.from_codes(bin_codes(df[column].to_numpy(), edges),
+                                                 categories=labels, ordered=True)
+        return df
+
+    def to_dict(self):
+        return {
+            'version': STATE_VERSION,
+            'fills': {column: value if isinstance(value, str) else float(value)
+                      for column, value in self.fills.items()},
+            'categories': self.categories,
+            'bins': self.bins,
+            'source': self.source,
+            'code': self.code,
+        }
+
+    def save(self, path=DEFAULT_STATE):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        return path
+
+
+def from_dict(state):
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"preprocessor state version {state.get('version')}, "
+                         f"expected {STATE_VERSION}")
+    return Preprocessor(state['fills'], state['categories'], state['bins'], state.get('source'),
+                        state.get('code'))
+
+
+def load(path=DEFAULT_STATE):
+    with open(path) as f:
+        return from_dict(json.load(f))
+
+
+def fit_file(source, sketch=False, chunksize=DEFAULT_CHUNKSIZE):
+    # Fit on a CSV and remember which version of it
+    preprocessor = Preprocessor()
+    if sketch:
+        preprocessor.fit_chunks(read_chunks(source, chunksize, dtype=titanic_dtypes(source)))
+    else:
+        preprocessor.fit(load_titanic(source))
+    preprocessor.source = file_hash(source)
+    return preprocessor
+
+
+def load_or_fit(path=DEFAULT_STATE, source='train.csv'):
+    # The saved state if it was fitted on source as it is now, by the code as it is now;
+    # otherwise fit on source and save it (like cache.py, keyed on data and code)
+    if path and os.path.exists(path):
+        preprocessor = load(path)
+        if preprocessor.source == file_hash(source) and preprocessor.code == state_code_version():
+            return preprocessor
+    preprocessor = fit_file(source)
+    if path:
+        preprocessor.save(path)
+    return preprocessor
+
+
+def score_file(preprocessor, path, output, chunksize=DEFAULT_CHUNKSIZE):
+    # Prepare and score a CSV chunk by chunk with the saved training state
+    columns = ['PassengerId', 'Name'] + list(MODELS)
+    rows = 0
+    with open(output, 'w', newline='') as f:
+        for number, chunk in enumerate(read_chunks(path, chunksize, dtype=titanic_dtypes(path))):
+            chunk = preprocessor.transform(chunk)
+            predictions = predict_all(chunk)
+            for model in MODELS:
+                chunk[model] = predictions[model]
+            chunk[columns].to_csv(f, index=False, header=number == 0)
+            rows += len(chunk)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fit or apply the Titanic preprocessing')
+    parser.add_argument('command', choices=['fit', 'score'])
+    parser.add_argument('path', help='training CSV for fit, passengers to score for score')
+    parser.add_argument('--state', default=DEFAULT_STATE)
+    parser.add_argument('--source', default='train.csv', help='training data if there is no state yet')
+    parser.add_argument('--output', default='titanic_test_predictions.csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--sketch', action='store_true',
+                        help='fit in one bounded-memory pass over chunks (approximate medians)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        preprocessor = fit_file(args.path, args.sketch, args.chunksize)
+        preprocessor.save(args.state)
+        print(f"Saved {args.state} ({os.path.getsize(args.state)} bytes): fills {preprocessor.fills}")
+    else:
+        preprocessor = load_or_fit(args.state, args.source)
+        rows = score_file(preprocessor, args.path, args.output, args.chunksize)
+        print(f"Scored {rows} passengers -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+# Stage timing for the Titanic scripts, switched on with an environment variable
+#   TITANIC_PROFILE=1 python day4_advanced_pandas.py
+#   TITANIC_PROFILE=nightly/run42 python pipeline.py   # -> nightly/run42.json / .folded
+#
+# Mark stages with the decorator or the context manager:
+#   @profiled('read_csv')
+#   def load_titanic(...): ...
+#
+#   with stage('correlation') as timing:
+#       ...
+#       timing.rows = len(df)
+#
+# Each stage records wall time, CPU time, how much the peak memory (RSS) of the
+# process went up, and the rows it handled. Stages inside stages are kept apart
+# ("pipeline;clean;read_csv"). At exit the totals are written as JSON and in the
+# "folded stacks" format that flamegraph.pl / speedscope read.
+#
+# When the variable isn't set, @profiled returns the function unchanged and
+# stage() hands back one shared do-nothing object, so the cost is a function call.
+import atexit
+import json
+import os
+import time
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV_VAR = 'TITANIC_PROFILE'
+DEFAULT_PREFIX = 'titanic_profile'
+
+
+def peak_rss_mb():
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class NullStage:
+    # What stage() returns when profiling is off
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_STAGE = NullStage()
+
+
+class Stage:
+
+    def __init__(self, profiler, name, rows=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.children_wall = 0.0
+
+    def __enter__(self):
+        self.profiler.stack.append(self)
+        self.start_rss = peak_rss_mb()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        rss = peak_rss_mb() - self.start_rss
+        stack = self.profiler.stack
+        stack.pop()
+        if stack:
+            stack[-1].children_wall += wall
+        path = ';'.join([outer.name for outer in stack] + [self.name])
+        self.profiler.record(path, wall, cpu, rss, self.rows, wall - self.children_wall)
+        return False
+
+
+class Profiler:
+
+    def __init__(self):
+        self.stack = []
+        self.stages = {}
+
+    def record(self, path, wall, cpu, rss, rows, self_wall):
+        totals = self.stages.setdefault(path, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                               'self_seconds': 0.0, 'peak_rss_delta_mb': 0.0,
+                                               'rows': 0})
+        totals['calls'] += 1
+        totals['wall_seconds'] += wall
+        totals['cpu_seconds'] += cpu
+        totals['self_seconds'] += self_wall
+        totals['peak_rss_delta_mb'] = max(totals['peak_rss_delta_mb'], rss)
+        totals['rows'] += rows or 0
+
+    def summary(self):
+        stages = {}
+        for path, totals in self.stages.items():
+            stages[path] = dict(totals)
+            if totals['rows'] and totals['wall_seconds']:
+                stages[path]['rows_per_second'] = totals['rows'] / totals['wall_seconds']
+        return {'peak_rss_mb': peak_rss_mb(), 'stages': stages}
+
+    def folded(self):
+        # "a;b;c <microseconds>" per stack, self time only (what flame graphs expect)
+        return ''.join(f"{path} {max(int(totals['self_seconds'] * 1e6), 0)}\n"
+                       for path, totals in self.stages.items())
+
+    def write(self, prefix=DEFAULT_PREFIX):
+        folder = os.path.dirname(prefix)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(prefix + '.json', 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        with open(prefix + '.folded', 'w') as f:
+            f.write(self.folded())
+        return prefix + '.json', prefix + '.folded'
+
+
+def output_prefix(value):
+    # TITANIC_PROFILE=1 / true / yes -> default file names, anything else is the prefix
+    return DEFAULT_PREFIX if value.lower() in ('1', 'true', 'yes', 'on') else value
+
+
+def enabled(value):
+    # Unset, empty, 0 / false / no / off -> profiling stays off
+    return bool(value) and value.strip().lower() not in ('0', 'false', 'no', 'off', '')
+
+
+ENABLED = enabled(os.environ.get(ENV_VAR))
+PROFILER = Profiler() if ENABLED else None
+if ENABLED:
+    atexit.register(PROFILER.write, output_prefix(os.environ[ENV_VAR]))
+
+
+def stage(name, rows=None):
+    if PROFILER is None:
+        return NULL_STAGE
+    return Stage(PROFILER, name, rows)
+
+
+def profiled(name=None):
+    # Decorator: time every call; rows = len(result) when the result has a length
+    def decorate(func):
+        if PROFILER is None:
+            return func
+        stage_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with Stage(PROFILER, stage_name) as timing:
+                result = func(*args, **kwargs)
+                if hasattr(result, '__len__'):
+                    timing.rows = len(result)
+            return result
+        return wrapper
+    return decorate
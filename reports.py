@@ -0,0 +1,218 @@
+# Report engine: many groupby reports over the same frame in one go
+# Every df.groupby(...) call hashes/sorts its key columns again. Here each key
+# column is turned into integer group codes once (pd.factorize), and every report
+# that uses it just counts and sums with np.bincount on those codes.
+#
+# A report is (keys, metrics):
+#   ('Sex', ['count', 'sum', 'mean'])  ~ df.groupby('Sex')['Survived'].agg([...])
+#   (['Pclass', 'Survived'], ['size'])  ~ rows per pair, what pd.crosstab counts
+#
+# python reports.py train.csv
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from features import (age_groups, cleaned_frame, decks, enriched_frame, fare_categories, family_size,
+                      name_features)
+from titanic_data import load_titanic
+
+# The survival breakdowns printed by day4_titanic_analysis.py and day4_advanced_pandas.py
+TITANIC_REPORTS = {
+    'Sex': ('Sex', ['count', 'sum', 'mean']),
+    'Pclass': ('Pclass', ['count', 'sum', 'mean']),
+    'AgeGroup': ('AgeGroup', ['mean']),
+    'FamilySize': ('FamilySize', ['mean']),
+    'Embarked': ('Embarked', ['mean']),
+    'FareCategory': ('FareCategory', ['mean']),
+    'Title_Simple': ('Title_Simple', ['mean']),
+    'Deck': ('Deck', ['mean']),
+    'Pclass_Sex': (['Pclass', 'Sex'], ['count', 'sum', 'mean']),
+    'Pclass_Survived': (['Pclass', 'Survived'], ['size']),
+}
+
+
+class GroupCodes:
+    # Integer group codes per key column, computed once and shared by all reports
+
+    def __init__(self, df):
+        self.df = df
+        self.columns = {}
+
+    def column(self, name):
+        if name not in self.columns:
+            # sort=True gives the same group order as groupby; missing keys get -1
+            codes, uniques = pd.factorize(self.df[name], sort=True)
+            self.columns[name] = (codes, uniques)
+        return self.columns[name]
+
+    def combined(self, keys):
+        # Several keys -> one code per row: code = c1 * n2 + c2 (like a 2-D array index)
+        if isinstance(keys, str):
+            codes, uniques = self.column(keys)
+            return codes, len(uniques), [uniques]
+        codes = None
+        sizes = []
+        levels = []
+        for name in keys:
+            key_codes, uniques = self.column(name)
+            if codes is None:
+                codes = key_codes.astype(np.int64)
+            else:
+                missing = (codes < 0) | (key_codes < 0)
+                codes = codes * len(uniques) + key_codes
+                codes[missing] = -1
+            sizes.append(len(uniques))
+            levels.append(uniques)
+        return codes, int(np.prod(sizes)), levels
+
+
+def group_index(keys, levels, group_ids):
+    # Turn combined group codes back into index labels
+    if isinstance(keys, str):
+        return pd.Index(levels[0].take(group_ids), name=keys)
+    arrays = []
+    remaining = group_ids
+    for uniques in reversed(levels):
+        arrays.append(uniques.take(remaining % len(uniques)))
+        remaining = remaining // len(uniques)
+    return pd.MultiIndex.from_arrays(arrays[::-1], names=keys)
+
+
+def run_reports(df, reports, value='Survived'):
+    codes_cache = GroupCodes(df)
+    values = df[value].to_numpy()
+    integer_values = np.issubdtype(values.dtype, np.integer)
+    values = values.astype(np.float64)
+    has_value = ~np.isnan(values)
+
+    tables = {}
+    for name, (keys, metrics) in reports.items():
+        codes, n_groups, levels = codes_cache.combined(keys)
+        in_group = codes >= 0
+        group_codes = codes[in_group]
+
+        size = np.bincount(group_codes, minlength=n_groups)
+        # Only groups that actually appear, like groupby(observed=True)
+        group_ids = np.flatnonzero(size)
+
+        counted = in_group & has_value
+        count = np.bincount(codes[counted], minlength=n_groups)
+        total = np.bincount(codes[counted], weights=values[counted], minlength=n_groups)
+
+        columns = {}
+        for metric in metrics:
+            if metric == 'size':
+                columns['size'] = size[group_ids]
+            elif metric == 'count':
+                columns['count'] = count[group_ids]
+            elif metric == 'sum':
+                sums = total[group_ids]
+                columns['sum'] = sums.astype(np.int64) if integer_values else sums
+            elif metric == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    columns['mean'] = total[group_ids] / count[group_ids]
+            else:
+                raise ValueError(f"Unknown metric: {metric}")
+        tables[name] = pd.DataFrame(columns, index=group_index(keys, levels, group_ids))
+    return tables
+
+
+def correlations(columns, target='Survived'):
+    # Correlation of every column with the target (like df.corr()[target], rows with
+    # a missing value skipped per pair), without building the whole matrix or a
+    # numeric copy of the frame. columns: name -> Series / array
+    y_all = np.asarray(columns[target], dtype=np.float64)
+    values = {}
+    for name, column in columns.items():
+        x = np.asarray(column, dtype=np.float64)
+        both = ~(np.isnan(x) | np.isnan(y_all))
+        y = y_all
+        if not both.all():
+            x, y = x[both], y[both]
+        dx = x - x.mean()
+        dy = y - y.mean()
+        values[name] = dx @ dy / np.sqrt((dx @ dx) * (dy @ dy))
+    return pd.Series(values, name=target)
+
+
+def column_correlations(df, columns, target='Survived'):
+    # correlations() for some columns of df; Sex_Numeric (1 for female) is made on
+    # the fly from Sex when df doesn't have it, instead of in a numeric copy of df
+    numeric = {}
+    for column in columns:
+        if column == 'Sex_Numeric' and column not in df:
+            numeric[column] = df['Sex'] == 'female'
+        else:
+            numeric[column] = df[column]
+    return correlations(numeric, target)
+
+
+def crosstab(size_table, margins=False, normalize=None):
+    # pd.crosstab(df[a], df[b]) from a (a, b) 'size' report
+    counts = size_table['size'].unstack(fill_value=0)
+    if normalize == 'index':
+        return counts.div(counts.sum(axis=1), axis=0)
+    if margins:
+        counts['All'] = counts.sum(axis=1)
+        counts.loc['All'] = counts.sum(axis=0)
+    return counts
+
+
+def add_report_features(df):
+    df['AgeGroup'] = age_groups(df['Age'])
+    df['FamilySize'] = family_size(df)
+    df['FareCategory'] = fare_categories(df['Fare'])
+    df['Title_Simple'] = name_features(df['Name'])['Title_Simple']
+    df['Deck'] = decks(df['Cabin'])
+    return df
+
+
+def cached_report_frame(source='train.csv'):
+    # add_report_features without redoing the feature work: AgeGroup / FamilySize and
+    # FareCategory / Title_Simple come from the cached cleaned and enriched frames
+    # (features.py), which are built and stored only when they're missing or stale
+    df = load_titanic(source)
+    cleaned = cleaned_frame(source)
+    enriched = enriched_frame(source)
+    for column in ['AgeGroup', 'FamilySize']:
+        df[column] = cleaned[column].array
+    for column in ['FareCategory', 'Title_Simple']:
+        df[column] = enriched[column].array
+    df['Deck'] = decks(df['Cabin'])
+    return df
+
+
+def titanic_tables(df):
+    # Every table the day4 scripts print, from one set of shared group codes
+    tables = run_reports(df, TITANIC_REPORTS)
+    for key in ['Sex', 'Pclass']:
+        tables[key]['survival_rate'] = tables[key]['mean'] * 100
+    tables['pivot'] = tables['Pclass_Sex']['mean'].unstack('Sex')
+    tables['crosstab'] = crosstab(tables['Pclass_Survived'], margins=True)
+    tables['crosstab_pct'] = crosstab(tables['Pclass_Survived'], normalize='index') * 100
+    return tables
+
+
+def print_tables(tables):
+    for key in ['Sex', 'Pclass']:
+        print(f"\nSurvival by {key}:")
+        print(tables[key])
+    for key in ['AgeGroup', 'FamilySize', 'Embarked', 'FareCategory', 'Title_Simple', 'Deck']:
+        print(f"\nSurvival by {key}:")
+        print(tables[key]['mean'] * 100)
+    print("\nDetailed breakdown by Class and Gender:")
+    print(tables['Pclass_Sex'])
+    print("\nSurvival rate by Class and Gender:")
+    print(tables['pivot'])
+    print("\nPassengers by Class and Survival:")
+    print(tables['crosstab'])
+    print("\nSurvival percentage by Class:")
+    print(tables['crosstab_pct'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='All Titanic survival reports in one pass')
+    parser.add_argument('path', nargs='?', default='train.csv')
+    args = parser.parse_args()
+    print_tables(titanic_tables(cached_report_frame(args.path)))
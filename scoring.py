@@ -0,0 +1,116 @@
+# Batch Scoring Engine for the Day 4 rule models
+# Every rule model is really a points system: each condition that holds adds
+# some points, and we predict "survived" when the score reaches a threshold.
+# Writing the rules down as data lets us turn each condition into one NumPy
+# mask over the whole column instead of calling a Python function per row.
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+
+# Conditions the rules are built from: (column, operator, value)
+CONDITIONS = {
+    'female': ('Sex', '==', 'female'),
+    'first_class': ('Pclass', '==', 1),
+    'child': ('Age', '<', 18),
+    'high_fare': ('Fare', '>', 50),
+}
+
+# The four models from day4_prediction_model.py
+# points = how many points each condition is worth
+MODELS = {
+    'Prediction_1': {
+        'name': 'Women only',
+        'points': {'female': 1},
+        'threshold': 1,
+    },
+    'Prediction_2': {
+        'name': 'Women + Children',
+        'points': {'female': 1, 'child': 1},
+        'threshold': 1,
+    },
+    'Prediction_3': {
+        'name': 'Women + 1st Class',
+        'points': {'female': 1, 'first_class': 1},
+        'threshold': 1,
+    },
+    'Prediction_4': {
+        'name': 'Scoring System',
+        'points': {'female': 2, 'first_class': 1, 'child': 1, 'high_fare': 1},
+        'threshold': 2,
+    },
+}
+
+OPERATORS = {
+    '==': np.equal,
+    '<': np.less,
+    '>': np.greater,
+    '<=': np.less_equal,
+    '>=': np.greater_equal,
+}
+
+
+def condition_mask(df, condition):
+    # One boolean array for the whole column
+    column, op, value = CONDITIONS[condition]
+    series = df[column]
+
+    # Categorical columns: compare the small integer codes, not the strings
+    if isinstance(series.dtype, pd.CategoricalDtype) and op == '==':
+        categories = series.cat.categories
+        if value not in categories:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == categories.get_loc(value)
+
+    values = series.to_numpy()
+    if values.dtype == object:
+        return values == value
+    # Missing numbers (NaN) compare as False, same as in the row functions
+    with np.errstate(invalid='ignore'):
+        return OPERATORS[op](values, value)
+
+
+def condition_masks(df, conditions=None):
+    # Build every mask once so several models can share them
+    if conditions is None:
+        conditions = CONDITIONS.keys()
+    return {name: condition_mask(df, name) for name in conditions}
+
+
+def score(df, model, masks=None):
+    spec = MODELS[model]
+    if masks is None:
+        masks = condition_masks(df, spec['points'])
+    total = np.zeros(len(df), dtype=np.int8)
+    for condition, points in spec['points'].items():
+        total += masks[condition].astype(np.int8) * points
+    return total
+
+
+def predict(df, model, masks=None):
+    return (score(df, model, masks) >= MODELS[model]['threshold']).astype(np.int64)
+
+
+@profiled('scoring')
+def predict_all(df, models=None):
+    # Score several models over the same frame, computing each mask only once
+    if models is None:
+        models = list(MODELS)
+    masks = condition_masks(df)
+    return pd.DataFrame({model: predict(df, model, masks) for model in models},
+                        index=df.index)
+
+
+# Single passenger (dict or row) - same rules, plain Python
+def check(passenger, condition):
+    column, op, value = CONDITIONS[condition]
+    return bool(OPERATORS[op](passenger[column], value))
+
+
+def predict_one(passenger, model='Prediction_4'):
+    spec = MODELS[model]
+    total = 0
+    for condition, points in spec['points'].items():
+        if check(passenger, condition):
+            total += points
+    return 1 if total >= spec['threshold'] else 0
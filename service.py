@@ -0,0 +1,270 @@
+# Survival prediction service (asyncio, no extra packages)
+# The fill values (Age / Fare median, most common port) come from a saved
+# preprocessing state (preprocessing.py), fitted on train.csv the first time
+# (and again whenever train.csv changes). Requests that arrive close together
+# are put into one batch and scored with the vectorized rules in scoring.py,
+# instead of one passenger at a time.
+#
+#   POST /predict            {"Sex": "female", "Pclass": 3, "Age": 22, "Fare": 7.25}
+#                            -> {"model": "Prediction_4", "prediction": 1}
+#   POST /predict            [{...}, {...}]  (a micro-batch)
+#                            -> {"model": "Prediction_4", "predictions": [1, 0]}
+#   POST /predict?model=Prediction_2
+#   GET  /stats              latency p50 / p99, requests and rows per second, batch sizes
+#
+# python service.py --port 8000
+# (load test: python -m benchmarks.bench_service)
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from scoring import MODELS, predict_all
+from preprocessing import DEFAULT_STATE, load_or_fit
+from titanic_data import SEX
+
+DEFAULT_MODEL = 'Prediction_4'
+# A batch is scored once it has this many rows, or this long after its first request
+MAX_BATCH_ROWS = 4096
+MAX_WAIT_SECONDS = 0.002
+# Latencies kept for the percentiles (the most recent ones)
+LATENCY_WINDOW = 10_000
+
+
+class Stats:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds, rows):
+        self.requests += 1
+        self.rows += rows
+        self.latencies.append(seconds)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        return {
+            'requests': self.requests,
+            'rows': self.rows,
+            'batches': self.batches,
+            'errors': self.errors,
+            'uptime_seconds': elapsed,
+            'requests_per_second': self.requests / elapsed,
+            'rows_per_second': self.rows / elapsed,
+            'mean_batch_rows': self.rows / self.batches if self.batches else 0.0,
+            'latency_ms_p50': float(p50),
+            'latency_ms_p99': float(p99),
+        }
+
+
+def records_frame(records, fills):
+    # Only the columns the rules look at, with the training fills for missing values
+    def numbers(column):
+        values = np.array([record.get(column) for record in records], dtype=np.float64)
+        return np.where(np.isnan(values), fills.get(column, np.nan), values)
+
+    return pd.DataFrame({
+        'Sex': pd.Categorical([record.get('Sex') for record in records], dtype=SEX),
+        'Pclass': numbers('Pclass'),
+        'Age': numbers('Age'),
+        'Fare': numbers('Fare'),
+    })
+
+
+def check_records(records):
+    # Catch bad values here, so they can't fail a batch shared with other requests
+    for record in records:
+        for column in ['Pclass', 'Age', 'Fare']:
+            value = record.get(column)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                return f"{column} must be a number or null, got {value!r}"
+        if record.get('Sex') not in (None, *SEX.categories):
+            return f"Sex must be one of {list(SEX.categories)} or null, got {record.get('Sex')!r}"
+    return None
+
+
+class Batcher:
+    # Collects (records, future) pairs from concurrent requests and scores them together
+
+    def __init__(self, fills, stats, max_rows=MAX_BATCH_ROWS, max_wait=MAX_WAIT_SECONDS):
+        self.fills = fills
+        self.stats = stats
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+
+    async def predict(self, records):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            self.score(batch)
+
+    def score(self, batch):
+        records = [record for request_records, _ in batch for record in request_records]
+        try:
+            predictions = predict_all(records_frame(records, self.fills))
+        except Exception as error:  # a bad record fails its batch, not the server
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.stats.batches += 1
+        start = 0
+        for request_records, future in batch:
+            stop = start + len(request_records)
+            if not future.done():
+                future.set_result(predictions.iloc[start:stop])
+            start = stop
+
+
+async def read_request(reader):
+    # Minimal HTTP/1.1: request line, headers, Content-Length body. None at end of stream.
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, _ = line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    return method, target, headers, body
+
+
+def response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found'}[status]
+    head = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+class PredictionService:
+
+    def __init__(self, source='train.csv', max_rows=MAX_BATCH_ROWS, max_wait=MAX_WAIT_SECONDS,
+                 state=DEFAULT_STATE):
+        # Everything learned from the training data, once
+        self.fills = load_or_fit(state, source).fills
+        self.stats = Stats()
+        self.batcher = Batcher(self.fills, self.stats, max_rows, max_wait)
+
+    async def handle(self, method, target, body):
+        url = urlsplit(target)
+        if method == 'GET' and url.path == '/stats':
+            return 200, self.stats.summary()
+        if method != 'POST' or url.path != '/predict':
+            return 404, {'error': f"no route for {method} {url.path}"}
+
+        model = parse_qs(url.query).get('model', [DEFAULT_MODEL])[0]
+        if model not in MODELS:
+            return 400, {'error': f"unknown model {model}"}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {'error': 'body is not JSON'}
+        single = isinstance(payload, dict)
+        records = [payload] if single else payload
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            return 400, {'error': 'expected a passenger object or a list of them'}
+        problem = check_records(records)
+        if problem:
+            return 400, {'error': problem}
+        if not records:
+            return 200, {'model': model, 'predictions': []}
+
+        start = time.perf_counter()
+        predictions = (await self.batcher.predict(records))[model].tolist()
+        self.stats.record(time.perf_counter() - start, len(records))
+        if single:
+            return 200, {'model': model, 'prediction': predictions[0]}
+        return 200, {'model': model, 'predictions': predictions}
+
+    async def connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, payload = await self.handle(method, target, body)
+                except Exception as error:
+                    self.stats.errors += 1
+                    status, payload = 400, {'error': str(error)}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000, ready=None):
+        batch_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.connection, host, port)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Titanic survival prediction service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--source', default='train.csv', help='training data for the fill values')
+    parser.add_argument('--state', default=DEFAULT_STATE,
+                        help='saved preprocessing state (fitted on --source if missing)')
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH_ROWS)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_SECONDS * 1000)
+    args = parser.parse_args(argv)
+
+    service = PredictionService(args.source, args.max_batch, args.max_wait_ms / 1000, args.state)
+    print(f"Serving on http://{args.host}:{args.port} (fills: {service.fills})")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+# Streaming sketches
+# df['Age'].median() needs the whole column in memory and sorted. A sketch reads
+# the data once, chunk by chunk, and keeps only a small summary:
+# - QuantileSketch (KLL-style) for medians / quantiles of numeric columns
+# - HeavyHitters (Misra-Gries) for the most common value of a text column
+# - CountMinSketch for approximate counts of very many distinct items
+# - BloomFilter for "have I seen this item before?"
+# Sketches built on separate chunks (or machines) can be merged.
+import heapq
+import math
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    # Values are kept in levels; an item on level h stands for 2**h original values.
+    # When a level holds more than `capacity` items we sort it and promote every
+    # other item to the next level (random offset), halving its size.
+    # The rank error of a quantile is roughly `error` (measured in bench_sketches).
+
+    def __init__(self, error=0.01, seed=0):
+        self.capacity = max(8, math.ceil(2 / error))
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.compress()
+        return self
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.compress()
+        return self
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # An odd item out stays on this level
+                keep = items[:len(items) % 2]
+                pairs = items[len(keep):]
+                promoted = pairs[self.rng.integers(2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float('nan')
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(items[order][min(position, len(items) - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def size(self):
+        # Items actually stored (the memory the sketch uses)
+        return sum(len(items) for items in self.levels)
+
+
+class HeavyHitters:
+    # Misra-Gries: at most `capacity` counters. When there are more, every counter
+    # drops by the size of the first one that doesn't fit, and zeros are removed.
+    # A count is under-estimated by at most rows / (capacity + 1).
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counters = {}
+        self.rows = 0
+
+    def update(self, values):
+        counts = pd.Series(values).value_counts(dropna=True)
+        counts = counts[counts > 0]  # categoricals also list unused categories
+        self.rows += int(counts.sum())
+        for value, count in counts.items():
+            self.counters[value] = self.counters.get(value, 0) + int(count)
+        self.prune()
+        return self
+
+    def merge(self, other):
+        for value, count in other.counters.items():
+            self.counters[value] = self.counters.get(value, 0) + count
+        self.rows += other.rows
+        self.prune()
+        return self
+
+    def prune(self):
+        if len(self.counters) <= self.capacity:
+            return
+        cut = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {value: count - cut for value, count in self.counters.items()
+                         if count > cut}
+
+    def top(self, n=10):
+        # Largest counts first; ties in value order, like Series.mode()
+        return sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def mode(self):
+        top = self.top(1)
+        return top[0][0] if top else None
+
+
+def exact_fill_values(df):
+    # The fills day4_prediction_model.py uses, computed on the full frame
+    return {
+        'Age': df['Age'].median(),
+        'Fare': df['Fare'].median(),
+        'Embarked': df['Embarked'].mode()[0],
+    }
+
+
+def sketch_fill_values(chunks, error=0.01):
+    # The same fills from one bounded-memory pass over an iterable of chunks
+    sketches = fill_sketches(chunks, error)
+    return fill_values_from(sketches)
+
+
+def fill_sketches(chunks, error=0.01):
+    sketches = {'Age': QuantileSketch(error), 'Fare': QuantileSketch(error),
+                'Embarked': HeavyHitters()}
+    for chunk in chunks:
+        sketches['Age'].update(chunk['Age'])
+        sketches['Fare'].update(chunk['Fare'])
+        sketches['Embarked'].update(chunk['Embarked'])
+    return sketches
+
+
+def fill_values_from(sketches):
+    return {
+        'Age': sketches['Age'].median(),
+        'Fare': sketches['Fare'].median(),
+        'Embarked': sketches['Embarked'].mode(),
+    }
+
+
+# Fixed-memory counting for word_counter / find_duplicates
+# Items are hashed in bulk with pandas; two hashes give as many as we need
+# (double hashing: h1 + i * h2), so there's no Python loop per item.
+HASH_KEY = 'titanic-sketch-1'  # pandas wants exactly 16 characters
+# pandas ignores hash_key for numbers, so the second hash re-mixes the first one
+SECOND_HASH_SALT = np.uint64(0x9E3779B97F4A7C15)
+
+
+def item_hashes(items, count):
+    # `count` hash values per item, shape (count, n_items)
+    # Same item -> same hash whether it came in a list or an array
+    items = np.asarray(items)
+    if items.dtype.kind in 'USO':
+        items = items.astype(object)
+    first = pd.util.hash_array(items, hash_key=HASH_KEY).astype(np.uint64)
+    second = pd.util.hash_array(first ^ SECOND_HASH_SALT) | np.uint64(1)
+    steps = np.arange(count, dtype=np.uint64)[:, None]
+    return first[None, :] + steps * second[None, :]
+
+
+class CountMinSketch:
+    # depth rows of width counters. An item adds its count to one counter per row;
+    # its estimate is the smallest of those counters. Estimates are never too low,
+    # and too high by at most epsilon * total with probability 1 - delta.
+    # `top` keeps a list of the heaviest items seen so far (their estimates).
+
+    def __init__(self, epsilon=0.001, delta=0.01, top=100):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+        self.top_size = top
+        self.top = {}
+
+    def columns(self, items):
+        return (item_hashes(items, self.depth) % np.uint64(self.width)).astype(np.int64)
+
+    def update(self, items, counts=None):
+        # items: distinct items of a batch, counts: how often each one appeared
+        if len(items) == 0:
+            return self
+        counts = np.ones(len(items), dtype=np.int64) if counts is None else np.asarray(counts)
+        columns = self.columns(items)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(columns[row], weights=counts,
+                                           minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+        self.track(items, self.estimate_columns(columns))
+        return self
+
+    def update_counts(self, counter):
+        # From a dict / Counter of exact counts for one block
+        return self.update(list(counter.keys()), list(counter.values()))
+
+    def estimate_columns(self, columns):
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def estimate(self, items):
+        return self.estimate_columns(self.columns(items))
+
+    def track(self, items, estimates):
+        # Keep the `top_size` items with the largest estimates
+        if not self.top_size:
+            return
+        for item, estimate in zip(items, estimates):
+            self.top[item] = int(estimate)
+        if len(self.top) > 2 * self.top_size:
+            self.top = dict(heapq.nlargest(self.top_size, self.top.items(), key=itemgetter(1)))
+
+    def merge(self, other):
+        if self.table.shape != other.table.shape:
+            raise ValueError("Can only merge sketches with the same epsilon / delta")
+        self.table += other.table
+        self.total += other.total
+        # Old estimates are stale after merging, so look the candidates up again
+        candidates = list(set(self.top) | set(other.top))
+        self.top = {}
+        if candidates:
+            self.track(candidates, self.estimate(candidates))
+        return self
+
+    def heavy_hitters(self, k=10):
+        return heapq.nlargest(k, self.top.items(), key=itemgetter(1))
+
+
+class BloomFilter:
+    # A bit array and `hashes` bit positions per item. If any of an item's bits is
+    # off, it was never added; if all are on it *probably* was (false positive
+    # rate about error_rate once `capacity` items are in). Merge = OR the bits.
+    # The bits are packed 8 to a byte: bit p is bit p % 8 of byte p // 8.
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def positions(self, items):
+        return (item_hashes(items, self.hashes) % np.uint64(self.size)).astype(np.int64)
+
+    def test(self, positions):
+        # Is each bit position on
+        return (self.bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1 == 1
+
+    def set(self, positions):
+        positions = positions.ravel()
+        np.bitwise_or.at(self.bits, positions >> 3, np.left_shift(1, positions & 7).astype(np.uint8))
+
+    def contains(self, items):
+        return self.test(self.positions(items)).all(axis=0)
+
+    def add(self, items):
+        self.set(self.positions(items))
+        return self
+
+    def seen_before(self, items):
+        # For each item of a batch (in order): was it seen earlier, in this batch
+        # or a previous one? Then remember the whole batch.
+        positions = self.positions(items)
+        earlier = self.test(positions).all(axis=0)
+        # Repeats inside the batch (the batch itself is already in memory)
+        repeated = pd.Series(np.asarray(items, dtype=object)).duplicated().to_numpy()
+        self.set(positions)
+        return earlier | repeated
+
+    def merge(self, other):
+        if self.size != other.size or self.hashes != other.hashes:
+            raise ValueError("Can only merge filters with the same capacity / error_rate")
+        self.bits |= other.bits
+        return self
@@ -0,0 +1,189 @@
+# Streaming CSV reports
+# Instead of pd.read_csv on the whole file, read it in chunks of rows and keep
+# only small partial results (counts and sums per group). Partial results from
+# different chunks just add up, so memory stays flat no matter how big the file is.
+#
+# python streaming.py train.csv --chunksize 100000
+import argparse
+
+import pandas as pd
+
+from features import age_groups, fare_categories, family_size
+from titanic_data import titanic_dtypes
+
+DEFAULT_CHUNKSIZE = 100_000
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    return pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)
+
+
+def add_partials(total, part):
+    # Add two partial tables, keeping groups that only appear in one of them
+    if total is None:
+        return part
+    return total.add(part, fill_value=0)
+
+
+class GroupStats:
+    # count / sum / mean of one column per group, built up chunk by chunk
+    # Matches df.groupby(keys)[value].agg(['count', 'sum', 'mean'])
+
+    def __init__(self, keys, value):
+        self.keys = keys
+        self.value = value
+        self.parts = None
+        self.categories = None
+        self.integer_sum = True
+
+    def update(self, chunk):
+        key_column = chunk[self.keys] if isinstance(self.keys, str) else None
+        if key_column is not None and isinstance(key_column.dtype, pd.CategoricalDtype):
+            self.categories = key_column.dtype
+        if not pd.api.types.is_integer_dtype(chunk[self.value].dtype):
+            self.integer_sum = False
+        part = chunk.groupby(self.keys, observed=True)[self.value].agg(['count', 'sum'])
+        # Widen small types (int8 Survived) so the running totals can't overflow
+        part = part.astype('int64' if self.integer_sum else 'float64')
+        self.parts = add_partials(self.parts, part)
+        return self
+
+    def merge(self, other):
+        self.parts = add_partials(self.parts, other.parts)
+        self.integer_sum = self.integer_sum and other.integer_sum
+        return self
+
+    def result(self):
+        table = self.parts.sort_index()
+        table['count'] = table['count'].astype('int64')
+        if self.integer_sum:
+            table['sum'] = table['sum'].astype('int64')
+        table['mean'] = table['sum'] / table['count']
+        if self.categories is not None:
+            # Put the categories back in their original order (Child, Teen, ...)
+            order = [c for c in self.categories.categories if c in table.index]
+            table = table.loc[order]
+            table.index = pd.CategoricalIndex(order, dtype=self.categories, name=self.keys)
+        return table
+
+    def mean(self):
+        return self.result()['mean']
+
+
+class PairCounts:
+    # Row counts for every (row_key, column_key) pair - what pd.crosstab counts
+
+    def __init__(self, row_key, column_key):
+        self.row_key = row_key
+        self.column_key = column_key
+        self.parts = None
+
+    def update(self, chunk):
+        part = chunk.groupby([self.row_key, self.column_key]).size()
+        self.parts = add_partials(self.parts, part)
+        return self
+
+    def merge(self, other):
+        self.parts = add_partials(self.parts, other.parts)
+        return self
+
+    def table(self):
+        counts = self.parts.astype('int64').unstack(self.column_key, fill_value=0)
+        return counts.sort_index().sort_index(axis=1)
+
+    def crosstab(self, margins=False, normalize=None):
+        counts = self.table()
+        if normalize == 'index':
+            return counts.div(counts.sum(axis=1), axis=0)
+        if margins:
+            counts['All'] = counts.sum(axis=1)
+            counts.loc['All'] = counts.sum(axis=0)
+        return counts
+
+
+class MissingCounts:
+    # Same numbers as df.isnull().sum(), plus the total row count
+
+    def __init__(self):
+        self.missing = None
+        self.rows = 0
+
+    def update(self, chunk):
+        self.missing = add_partials(self.missing, chunk.isnull().sum())
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        self.missing = add_partials(self.missing, other.missing)
+        self.rows += other.rows
+        return self
+
+    def result(self):
+        return self.missing.astype('int64')
+
+
+def add_titanic_features(chunk):
+    # Row-local features only: every chunk can compute these on its own
+    chunk['AgeGroup'] = age_groups(chunk['Age'])
+    chunk['FareCategory'] = fare_categories(chunk['Fare'])
+    chunk['FamilySize'] = family_size(chunk)
+    return chunk
+
+
+def titanic_reports(path, chunksize=DEFAULT_CHUNKSIZE):
+    # One pass over the file, building every report from day4 at the same time
+    groups = {
+        'Sex': GroupStats('Sex', 'Survived'),
+        'Pclass': GroupStats('Pclass', 'Survived'),
+        'AgeGroup': GroupStats('AgeGroup', 'Survived'),
+        'FamilySize': GroupStats('FamilySize', 'Survived'),
+        'Embarked': GroupStats('Embarked', 'Survived'),
+        'FareCategory': GroupStats('FareCategory', 'Survived'),
+        'Pclass_Sex': GroupStats(['Pclass', 'Sex'], 'Survived'),
+    }
+    class_survived = PairCounts('Pclass', 'Survived')
+    missing = MissingCounts()
+
+    # Fixed categories for Sex / Embarked keep every chunk's codes the same
+    for chunk in read_chunks(path, chunksize, dtype=titanic_dtypes(path)):
+        # Missing counts are taken before we add any new columns
+        missing.update(chunk)
+        chunk = add_titanic_features(chunk)
+        for stats in groups.values():
+            stats.update(chunk)
+        class_survived.update(chunk)
+
+    reports = {name: stats.result() for name, stats in groups.items()}
+    reports['pivot'] = reports['Pclass_Sex']['mean'].unstack('Sex')
+    reports['crosstab'] = class_survived.crosstab(margins=True)
+    reports['crosstab_pct'] = class_survived.crosstab(normalize='index') * 100
+    reports['missing'] = missing.result()
+    reports['rows'] = missing.rows
+    return reports
+
+
+def print_titanic_reports(reports):
+    print(f"Rows streamed: {reports['rows']}")
+    print("\nMissing values per column:")
+    print(reports['missing'])
+    for key in ['Sex', 'Pclass']:
+        table = reports[key].copy()
+        table['survival_rate'] = table['mean'] * 100
+        print(f"\nSurvival by {key}:")
+        print(table)
+    for key in ['AgeGroup', 'FamilySize', 'Embarked', 'FareCategory']:
+        print(f"\nSurvival by {key}:")
+        print(reports[key]['mean'] * 100)
+    print("\nSurvival rate by Class and Gender:")
+    print(reports['pivot'])
+    print("\nPassengers by Class and Survival:")
+    print(reports['crosstab'])
+    print("\nSurvival percentage by Class:")
+    print(reports['crosstab_pct'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Chunked Titanic reports')
+    parser.add_argument('path', nargs='?', default='train.csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+    print_titanic_reports(titanic_reports(args.path, args.chunksize))
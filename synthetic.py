@@ -0,0 +1,167 @@
+# Synthetic Titanic passengers, as many as you like, that look like train.csv
+# The 891 real rows are too few to find scaling problems. Copying real rows over
+# and over (benchmarks.common.make_passengers) keeps the distributions but not the
+# variety: there are still only 891 names, tickets and ages.
+#
+# Here each new passenger starts from a real one picked at random, which keeps
+# the joint distribution of class, sex, title, age (and whether it's missing),
+# family, fare, port, deck and survival. Then the details are redrawn:
+#   - Age moves by a couple of years (babies' ages are kept), Fare by a few percent
+#   - Name = a random surname + the same title + a first name used with that title
+#   - Ticket and cabin number are new (the deck letter is kept)
+#
+# Rows are made in chunks, each with its own random generator seeded by
+# (seed, chunk start), so the output only depends on the seed and chunk size,
+# not on how many worker processes made it.
+#
+# python synthetic.py 1e7 --output passengers.csv --workers 8
+# python synthetic.py 1e7 --output passengers_parquet --format parquet
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from features import name_features
+
+CHUNK_ROWS = 1 << 18
+TEMPLATE_COLUMNS = ['Survived', 'Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked']
+COLUMNS = ['PassengerId', 'Survived', 'Pclass', 'Name', 'Sex', 'Age', 'SibSp', 'Parch',
+           'Ticket', 'Fare', 'Cabin', 'Embarked']
+
+
+def fit(path='train.csv'):
+    # Everything make_chunk needs, from the real file
+    df = pd.read_csv(path)
+    names = name_features(df['Name'])
+    titles = names['Title'].astype(object).fillna('Mr')
+    # The part after "Title. " (first names, maiden name in brackets)
+    given = df['Name'].str.split('.', n=1).str[1].str.strip().fillna('')
+
+    title_codes, title_values = pd.factorize(titles)
+    return {
+        'templates': {column: df[column].to_numpy() for column in TEMPLATE_COLUMNS},
+        'title_codes': title_codes,
+        'titles': np.array(title_values, dtype=object),
+        # First names per title, so "Master" stays with boys' names and so on
+        'given': [given[title_codes == code].to_numpy(dtype=object)
+                  for code in range(len(title_values))],
+        'surnames': names['Surname'].dropna().unique().astype(object),
+        'decks': df['Cabin'].str[:1].to_numpy(dtype=object),
+    }
+
+
+def make_chunk(model, start, stop, seed=0):
+    rng = np.random.default_rng([seed, start])
+    n_rows = stop - start
+    templates = model['templates']
+    picks = rng.integers(0, len(templates['Pclass']), n_rows)
+    columns = {column: values[picks] for column, values in templates.items()}
+
+    age = columns['Age']
+    adult = age >= 1
+    age[adult] = np.clip(np.round(age[adult] + rng.normal(0, 2, adult.sum())), 1, 80)
+    columns['Fare'] = np.round(columns['Fare'] * np.exp(rng.normal(0, 0.05, n_rows)), 4)
+    df = pd.DataFrame(columns)
+
+    # Name: surname + the template's title + a first name seen with that title
+    title_codes = model['title_codes'][picks]
+    given = np.empty(n_rows, dtype=object)
+    for code, pool in enumerate(model['given']):
+        rows = np.flatnonzero(title_codes == code)
+        if len(rows):
+            given[rows] = pool[rng.integers(0, len(pool), len(rows))]
+    surnames = model['surnames'][rng.integers(0, len(model['surnames']), n_rows)]
+    df['Name'] = surnames + ', ' + model['titles'][title_codes] + '. ' + given
+
+    df['Ticket'] = rng.integers(10_000, 4_000_000, n_rows).astype(str)
+    deck = model['decks'][picks]
+    has_cabin = pd.notna(deck)
+    cabin = np.full(n_rows, np.nan, dtype=object)
+    cabin[has_cabin] = deck[has_cabin] + rng.integers(1, 150, has_cabin.sum()).astype(str)
+    df['Cabin'] = cabin
+    df['PassengerId'] = np.arange(start + 1, stop + 1)
+    return df[COLUMNS]
+
+
+def chunk_bounds(n_rows, chunk_rows=CHUNK_ROWS):
+    return [(start, min(start + chunk_rows, n_rows)) for start in range(0, n_rows, chunk_rows)]
+
+
+def generate(n_rows, seed=0, chunk_rows=CHUNK_ROWS, source='train.csv'):
+    # Chunks as DataFrames, one after another (never all rows in memory)
+    model = fit(source)
+    for start, stop in chunk_bounds(n_rows, chunk_rows):
+        yield make_chunk(model, start, stop, seed)
+
+
+def csv_bytes(df, header=True):
+    # pyarrow's CSV writer is about 10x faster than DataFrame.to_csv; same file for read_csv
+    try:
+        import pyarrow as pa
+        import pyarrow.csv
+    except ImportError:
+        return df.to_csv(index=False, header=header).encode()
+    buffer = io.BytesIO()
+    options = pyarrow.csv.WriteOptions(include_header=header, quoting_style='needed')
+    pyarrow.csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer, options)
+    return buffer.getvalue()
+
+
+def csv_chunk(model, start, stop, seed):
+    # Runs in a worker: formatting CSV text is the slow part, so it happens here
+    return csv_bytes(make_chunk(model, start, stop, seed), header=start == 0)
+
+
+def parquet_chunk(model, start, stop, seed, path):
+    part = os.path.join(path, f"part-{start:012d}.parquet")
+    make_chunk(model, start, stop, seed).to_parquet(part, index=False)
+    return part
+
+
+def write(path, n_rows, seed=0, workers=None, chunk_rows=CHUNK_ROWS, format='csv',
+          source='train.csv'):
+    # CSV: one file, chunks written in order. Parquet: a directory of part files
+    # (pd.read_parquet(path) reads them all back as one frame)
+    model = fit(source)
+    bounds = chunk_bounds(n_rows, chunk_rows)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if format == 'parquet':
+            os.makedirs(path, exist_ok=True)
+            jobs = [pool.submit(parquet_chunk, model, start, stop, seed, path)
+                    for start, stop in bounds]
+            return [job.result() for job in jobs]
+        with open(path, 'wb') as f:
+            if not bounds:
+                f.write((','.join(COLUMNS) + '\n').encode())
+            # Keep only a few chunks in flight so memory stays bounded
+            window = 2 * (workers or os.cpu_count() or 1)
+            jobs = []
+            for start, stop in bounds:
+                jobs.append(pool.submit(csv_chunk, model, start, stop, seed))
+                if len(jobs) >= window:
+                    f.write(jobs.pop(0).result())
+            for job in jobs:
+                f.write(job.result())
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic Titanic passengers')
+    parser.add_argument('rows', help='how many rows, e.g. 1e7')
+    parser.add_argument('--output', default='synthetic_passengers.csv')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--source', default='train.csv', help='real data to imitate')
+    args = parser.parse_args(argv)
+
+    write(args.output, int(float(args.rows)), args.seed, args.workers, args.chunk_rows,
+          args.format, args.source)
+
+
+if __name__ == '__main__':
+    main()
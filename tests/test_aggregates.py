@@ -0,0 +1,88 @@
+# Merged aggregate stores must match recomputing everything from scratch
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregates import (AggregateStore, TITANIC_GROUPINGS, TITANIC_VALUES, combine_stats,
+                        titanic_store)
+from streaming import add_titanic_features
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def passengers():
+    # train.csv rows picked at random (fixed seed), several times over
+    base = pd.read_csv(os.path.join(ROOT, 'train.csv'))
+    picks = np.random.default_rng(0).integers(0, len(base), 20_000)
+    return base.iloc[picks].reset_index(drop=True)
+
+
+def full_table(df, keys, value):
+    # The from-scratch answer the store has to match
+    grouped = df[value].astype('float64').groupby(
+        [df[key] for key in keys] if isinstance(keys, list) else
+        (df[keys] if keys else np.zeros(len(df))), observed=True)
+    return grouped.agg(['count', 'sum', 'mean', 'std', 'min', 'max'])
+
+
+def assert_matches(store, df):
+    for name, keys in TITANIC_GROUPINGS.items():
+        for value in TITANIC_VALUES:
+            expected = full_table(df, keys, value).to_numpy()
+            actual = store.table(name, value).to_numpy()
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True,
+                                       err_msg=f"{name} / {value}")
+
+
+def batches_of(df, size):
+    return [df.iloc[start:start + size].copy() for start in range(0, len(df), size)]
+
+
+def test_batches_match_full_recomputation(passengers):
+    store = titanic_store(batches_of(passengers, 1000))
+    assert store.rows == len(passengers)
+    assert_matches(store, add_titanic_features(passengers))
+
+
+def test_merged_stores_match_full_recomputation(passengers):
+    # One store per worker over interleaved batches (uneven sizes), then merged
+    batches = batches_of(passengers, 777)
+    stores = [titanic_store(batches[worker::4]) for worker in range(4)]
+    merged = stores[0]
+    for other in stores[1:]:
+        merged.merge(other)
+    assert merged.rows == len(passengers)
+    assert_matches(merged, add_titanic_features(passengers))
+
+
+def test_merge_order_does_not_matter(passengers):
+    left, right = batches_of(passengers, 12_000)
+    ab = titanic_store([left]).merge(titanic_store([right]))
+    ba = titanic_store([right]).merge(titanic_store([left]))
+    for name in TITANIC_GROUPINGS:
+        for value in TITANIC_VALUES:
+            pd.testing.assert_frame_equal(ab.table(name, value), ba.table(name, value), rtol=1e-12)
+
+
+def test_m2_keeps_precision_on_large_offsets():
+    # sum(x^2) - n * mean^2 loses everything here; the M2 merge must not
+    rng = np.random.default_rng(1)
+    values = 1e9 + rng.normal(0, 1, 10_000)
+    df = pd.DataFrame({'Group': 'a', 'Fare': values})
+    store = AggregateStore({'Group': 'Group'}, ['Fare'])
+    for batch in batches_of(df, 333):
+        store.update(batch)
+    assert store.table('Group', 'Fare')['std'].iloc[0] == pytest.approx(values.std(ddof=1), rel=1e-6)
+
+
+def test_single_value_groups_have_no_spread():
+    df = pd.DataFrame({'Group': ['a', 'b', 'b'], 'Fare': [5.0, 1.0, 3.0]})
+    store = AggregateStore({'Group': 'Group'}, ['Fare'])
+    store.update(df.iloc[:2]).update(df.iloc[2:])
+    table = store.table('Group', 'Fare')
+    assert np.isnan(table.loc['a', 'std'])
+    assert table.loc['b', 'std'] == pytest.approx(np.sqrt(2))
+    assert combine_stats(None, None) is None
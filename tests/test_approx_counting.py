@@ -0,0 +1,107 @@
+# Count-Min and Bloom filter guarantees, on fixed-seed data
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from find_duplicates import find_duplicates, find_duplicates_approx
+from sketches import BloomFilter, CountMinSketch
+
+EPSILON = 0.001
+DELTA = 0.01
+ERROR_RATE = 0.01
+
+
+@pytest.fixture(scope='module')
+def items():
+    # A few very common ids, most seen once or twice
+    return np.random.default_rng(0).zipf(1.3, 200_000)
+
+
+@pytest.fixture(scope='module')
+def exact(items):
+    return Counter(items.tolist())
+
+
+def test_count_min_never_under_counts(items, exact):
+    sketch = CountMinSketch(EPSILON, DELTA).update(items)
+    keys = np.array(list(exact))
+    errors = sketch.estimate(keys) - np.array([exact[key] for key in keys])
+    assert (errors >= 0).all()
+    assert sketch.total == len(items)
+
+
+def test_count_min_within_epsilon_n(items, exact):
+    sketch = CountMinSketch(EPSILON, DELTA).update(items)
+    keys = np.array(list(exact))
+    errors = sketch.estimate(keys) - np.array([exact[key] for key in keys])
+    # Each estimate is within epsilon * N with probability 1 - delta
+    assert (errors <= EPSILON * len(items)).mean() >= 1 - DELTA
+
+
+def test_count_min_counts_argument(exact):
+    keys = list(exact)
+    by_items = CountMinSketch(EPSILON, DELTA).update(np.repeat(keys, [exact[key] for key in keys]))
+    by_counts = CountMinSketch(EPSILON, DELTA).update_counts(exact)
+    np.testing.assert_array_equal(by_items.table, by_counts.table)
+
+
+def test_count_min_merge_equals_one_sketch(items, exact):
+    whole = CountMinSketch(EPSILON, DELTA, top=10).update(items)
+    merged = CountMinSketch(EPSILON, DELTA, top=10)
+    for part in np.array_split(items, 4):
+        merged.merge(CountMinSketch(EPSILON, DELTA, top=10).update(part))
+    np.testing.assert_array_equal(merged.table, whole.table)
+    assert merged.total == whole.total
+    expected_top = [key for key, _ in exact.most_common(5)]
+    assert [key for key, _ in merged.heavy_hitters(5)] == expected_top
+
+
+def test_count_min_merge_needs_same_shape():
+    with pytest.raises(ValueError):
+        CountMinSketch(0.001).merge(CountMinSketch(0.01))
+
+
+def test_bloom_filter_has_no_false_negatives(items):
+    bloom = BloomFilter(len(items), ERROR_RATE).add(items)
+    assert bloom.contains(items).all()
+
+
+def test_bloom_filter_false_positive_rate(items):
+    bloom = BloomFilter(len(items), ERROR_RATE).add(items)
+    others = np.arange(-len(items), 0)  # zipf ids are all positive
+    assert bloom.contains(others).mean() < 2 * ERROR_RATE
+
+
+def test_seen_before_finds_every_repeat(items):
+    bloom = BloomFilter(len(items), ERROR_RATE)
+    repeats = np.concatenate([bloom.seen_before(chunk) for chunk in np.array_split(items, 7)])
+    first_copy = np.zeros(len(items), dtype=bool)
+    first_copy[np.unique(items, return_index=True)[1]] = True
+    assert repeats[~first_copy].all()
+
+
+def test_approx_duplicates_no_missed_duplicates_at_low_error_rate(items):
+    expected = find_duplicates(items.tolist())
+    found = find_duplicates_approx(items, len(items), 1e-6, chunk_size=10_000)
+    assert set(found) >= set(expected)
+    assert len(found) == len(set(found))
+
+
+def test_approx_duplicates_error_rates(items):
+    expected = set(find_duplicates(items.tolist()))
+    found = set(find_duplicates_approx(items, len(items), ERROR_RATE, chunk_size=10_000))
+    unique = len(np.unique(items)) - len(expected)
+    # Missed: only when the "already reported" filter has a false positive
+    assert len(expected - found) <= 2 * ERROR_RATE * len(expected)
+    assert len(found - expected) <= 2 * ERROR_RATE * unique
+
+
+def test_bloom_merge_equals_one_filter(items):
+    halves = np.array_split(items, 2)
+    first = BloomFilter(len(items), ERROR_RATE).add(halves[0])
+    second = BloomFilter(len(items), ERROR_RATE).add(halves[1])
+    whole = BloomFilter(len(items), ERROR_RATE).add(items)
+    np.testing.assert_array_equal(first.merge(second).bits, whole.bits)
+    with pytest.raises(ValueError):
+        first.merge(BloomFilter(10, ERROR_RATE))
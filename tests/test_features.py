@@ -0,0 +1,41 @@
+# Per-distinct-value features must match the plain row-wise versions, including
+# when a column has no values at all
+import os
+
+import numpy as np
+import pandas as pd
+
+from features import decks, name_features, spread_to_rows
+from reports import add_report_features, titanic_tables
+from titanic_data import load_titanic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN = os.path.join(ROOT, 'train.csv')
+
+
+def test_decks_match_first_letters():
+    cabin = load_titanic(TRAIN)['Cabin']
+    expected = cabin.str[0]
+    result = decks(cabin)
+    assert result.isna().equals(expected.isna())
+    assert (result.astype(object)[expected.notna()] == expected[expected.notna()]).all()
+
+
+def test_decks_all_missing():
+    result = decks(pd.Series([np.nan, np.nan], index=[3, 7]))
+    assert list(result.index) == [3, 7]
+    assert result.isna().all()
+    assert len(result.cat.categories) == 0
+
+
+def test_spread_to_rows_empty():
+    assert len(spread_to_rows([], np.array([], dtype=np.intp))) == 0
+    assert len(name_features(pd.Series([], dtype=object))) == 0
+
+
+def test_reports_without_cabins():
+    df = load_titanic(TRAIN)
+    df['Cabin'] = np.nan
+    tables = titanic_tables(add_report_features(df))
+    assert len(tables['Deck']) == 0
+    assert tables['Sex']['count'].sum() == len(df)
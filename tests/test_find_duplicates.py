@@ -0,0 +1,43 @@
+# The NumPy, chunked and row-key duplicate finders must match the original dict
+# version: same values, in the order their second occurrence shows up
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_duplicates import chunks_of, make_ids
+from benchmarks.common import make_passengers
+from find_duplicates import (find_duplicate_rows, find_duplicates, find_duplicates_array,
+                             find_duplicates_chunked, row_keys)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def ids():
+    return make_ids(50_000)
+
+
+def test_array_matches_dict(ids):
+    assert find_duplicates_array(ids).tolist() == find_duplicates(ids.tolist())
+
+
+@pytest.mark.parametrize('chunk_size', [7, 999, 50_000])
+def test_chunked_matches_array(ids, chunk_size):
+    expected = find_duplicates_array(ids)
+    assert np.array_equal(find_duplicates_chunked(chunks_of(ids, chunk_size)), expected)
+
+
+def test_small_inputs():
+    assert find_duplicates_array(np.array([], dtype=np.int64)).tolist() == []
+    assert find_duplicates_array(np.array([3, 1, 3, 3, 1, 2])).tolist() == find_duplicates([3, 1, 3, 3, 1, 2])
+
+
+def test_rows_match_dict():
+    df = make_passengers(5_000, source=os.path.join(ROOT, 'train.csv'))
+    keys = ['Ticket', 'Pclass']
+    duplicated = find_duplicate_rows(df, keys)
+    assert list(duplicated.itertuples(index=False, name=None)) == \
+        find_duplicates(list(zip(df['Ticket'], df['Pclass'])))
+    hashed = find_duplicates_chunked(chunks_of(row_keys(df, keys), 1_000))
+    assert np.array_equal(hashed, row_keys(duplicated))
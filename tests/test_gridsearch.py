@@ -0,0 +1,40 @@
+# The cross-validated estimate must come from every candidate, not only the ones
+# that survived pruning
+import os
+
+import numpy as np
+import pytest
+
+from gridsearch import cross_validated, decisions, fold_ids, pattern_codes, pattern_counts, search
+from preprocessing import Preprocessor
+from scoring import CONDITIONS, condition_masks
+from titanic_data import load_titanic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def passengers():
+    df = load_titanic(os.path.join(ROOT, 'train.csv'))
+    return Preprocessor().fit(df).transform(df)
+
+
+def test_cross_validated_needs_unpruned(passengers):
+    counts = pattern_counts(passengers, list(CONDITIONS), workers=1)
+    with pytest.raises(ValueError):
+        cross_validated(search(counts, list(CONDITIONS)))
+
+
+def test_picks_are_best_on_training_rows(passengers):
+    conditions = list(CONDITIONS)
+    counts = pattern_counts(passengers, conditions, workers=1)
+    result = search(counts, conditions, prune=False)
+    # Row-level predictions for every candidate, straight from the frame
+    codes = pattern_codes(condition_masks(passengers, conditions), conditions)
+    predicted = decisions(result['weights'], result['thresholds'])[codes]
+    correct = predicted == passengers['Survived'].to_numpy()[:, None]
+    folds = fold_ids(len(passengers))
+    for fold, (best, accuracy) in enumerate(cross_validated(result)):
+        training = correct[folds != fold].mean(axis=0)
+        assert training[best] == training.max()
+        assert accuracy == pytest.approx(correct[folds == fold, best].mean())
@@ -0,0 +1,22 @@
+# Batched confusion matrices must match per-model mask sums, and streaming a
+# scored CSV must give the same table as reading it whole
+import numpy as np
+import pytest
+
+from benchmarks.bench_metrics import evaluate_whole, mask_sums, scored_frame
+from metrics import confusion_matrices, evaluate_file
+
+
+@pytest.mark.parametrize('n_models', [1, 4, 64])
+def test_confusion_matrices_match_mask_sums(n_models):
+    df = scored_frame(20_000, n_models)
+    models = [column for column in df.columns if column != 'Survived']
+    counts = confusion_matrices(df['Survived'], df[models])
+    assert np.array_equal(counts, mask_sums(df, models))
+
+
+@pytest.mark.parametrize('chunksize', [999, 5_000, 100_000])
+def test_streamed_table_matches_whole_file(tmp_path, chunksize):
+    path = tmp_path / 'scored.csv'
+    scored_frame(20_000, 4).to_csv(path, index=False)
+    assert evaluate_file(path, None, 'Survived', chunksize).equals(evaluate_whole(path))
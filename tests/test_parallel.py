@@ -0,0 +1,45 @@
+# Sharded runs must match a serial run, and a serial run must match the plain
+# DataFrame pipeline (Preprocessor -> name features -> predict_all)
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import synthetic
+from features import name_features
+from parallel import OUTPUTS, PREPARED_OUTPUTS, run_parallel, run_serial
+from preprocessing import Preprocessor
+from scoring import MODELS, predict_all
+from titanic_data import TITANIC_DTYPES, load_titanic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN = os.path.join(ROOT, 'train.csv')
+
+
+@pytest.fixture(scope='module')
+def passengers():
+    df = pd.concat(synthetic.generate(20_000, source=TRAIN), ignore_index=True)
+    return df.astype({'Sex': TITANIC_DTYPES['Sex'], 'Embarked': TITANIC_DTYPES['Embarked']})
+
+
+def test_matches_dataframe_pipeline():
+    df = load_titanic(TRAIN)
+    result = run_serial(df)
+    prepared = Preprocessor().fit(df).transform(df)
+    assert list(result.columns) == OUTPUTS
+    for column in PREPARED_OUTPUTS:
+        np.testing.assert_array_equal(result[column].to_numpy(), prepared[column].to_numpy(),
+                                      err_msg=column)
+    predictions = predict_all(prepared)
+    for model in MODELS:
+        np.testing.assert_array_equal(result[model].to_numpy(), predictions[model].to_numpy(),
+                                      err_msg=model)
+    titles = name_features(df['Name'])['Title_Simple']
+    assert list(result['Title_Simple'].astype(object)) == list(titles.astype(object))
+
+
+@pytest.mark.parametrize('workers, shards', [(1, 1), (2, 3), (2, 16)])
+def test_parallel_matches_serial(passengers, workers, shards):
+    expected = run_serial(passengers)
+    assert run_parallel(passengers, workers, shards).equals(expected)
@@ -0,0 +1,43 @@
+# The one-pass report engine must give the same tables as a groupby per table
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_reports import separate_groupbys
+from benchmarks.common import make_passengers
+from reports import TITANIC_REPORTS, add_report_features, titanic_tables
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module', params=[891, 20_000], ids=['small', 'resampled'])
+def tables(request):
+    df = add_report_features(make_passengers(request.param, source=os.path.join(ROOT, 'train.csv')))
+    return titanic_tables(df), separate_groupbys(df)
+
+
+def labels(index):
+    return [tuple(map(str, key)) if isinstance(key, tuple) else str(key) for key in index]
+
+
+@pytest.mark.parametrize('name', list(TITANIC_REPORTS))
+def test_report_tables(tables, name):
+    fast, slow = tables
+    expected = slow[name]
+    # Size tables come back as a one-column frame; Sex / Pclass get an extra
+    # survival_rate column
+    actual = fast[name][list(expected.columns)] if isinstance(expected, pd.DataFrame) else \
+        fast[name]['size']
+    assert labels(actual.index) == labels(expected.index)
+    np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                               rtol=1e-12, equal_nan=True)
+
+
+def test_pivot_and_crosstabs(tables):
+    fast, slow = tables
+    assert fast['crosstab'].equals(slow['crosstab'])
+    np.testing.assert_allclose(fast['pivot'].to_numpy(), slow['pivot'].to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(fast['crosstab_pct'].to_numpy(), slow['crosstab_pct'].to_numpy(),
+                               rtol=1e-12)
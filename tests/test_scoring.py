@@ -0,0 +1,61 @@
+# The vectorized rule models must give the same predictions as the original
+# row-by-row functions from day4_prediction_model.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_scoring import ROW_MODELS
+from preprocessing import Preprocessor
+from scoring import MODELS, predict_all, predict_one
+from titanic_data import load_titanic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN = os.path.join(ROOT, 'train.csv')
+
+
+def raw():
+    # Straight from read_csv: object strings, missing ages
+    return pd.read_csv(TRAIN)
+
+
+def typed():
+    # Categorical Sex / Embarked, as the loader gives them
+    return load_titanic(TRAIN)
+
+
+def prepared():
+    # Filled the way day4_prediction_model.py does before scoring
+    df = load_titanic(TRAIN)
+    return Preprocessor().fit(df).transform(df)
+
+
+@pytest.fixture(params=[raw, typed, prepared], ids=['raw', 'typed', 'prepared'])
+def frame(request):
+    return request.param()
+
+
+def expected_predictions(df):
+    return {model: df.apply(function, axis=1).to_numpy() for model, function in ROW_MODELS.items()}
+
+
+def test_predict_all(frame):
+    predictions = predict_all(frame)
+    assert list(predictions.columns) == list(MODELS)
+    assert predictions.index.equals(frame.index)
+    for model, expected in expected_predictions(frame).items():
+        np.testing.assert_array_equal(predictions[model].to_numpy(), expected, err_msg=model)
+
+
+def test_predict_one(frame):
+    expected = expected_predictions(frame)
+    for model in MODELS:
+        actual = [predict_one(row, model) for _, row in frame.iterrows()]
+        np.testing.assert_array_equal(actual, expected[model], err_msg=model)
+
+
+def test_predict_one_dict():
+    passenger = {'Sex': 'male', 'Pclass': 1, 'Age': 10, 'Fare': 30}
+    for model, function in ROW_MODELS.items():
+        assert predict_one(passenger, model) == function(passenger), model
@@ -0,0 +1,34 @@
+# Chunked reports must match the full-load groupbys from the day4 scripts
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_streaming import full_load_reports
+from benchmarks.common import make_passengers
+from streaming import titanic_reports
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def passengers(tmp_path_factory):
+    path = tmp_path_factory.mktemp('streaming') / 'passengers.csv'
+    make_passengers(20_000, source=os.path.join(ROOT, 'train.csv')).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('chunksize', [1_000, 7_777, 100_000])
+def test_same_reports(passengers, chunksize):
+    full = full_load_reports(passengers)
+    stream = titanic_reports(passengers, chunksize)
+    assert stream['rows'] == 20_000
+    assert stream['crosstab'].equals(full['crosstab'])
+    assert stream['missing'].equals(full['missing'])
+    for key in ['Sex', 'Pclass', 'AgeGroup', 'FamilySize', 'Embarked', 'FareCategory']:
+        assert stream[key][['count', 'sum']].to_numpy().tolist() == \
+            full[key][['count', 'sum']].to_numpy().tolist(), key
+        np.testing.assert_allclose(stream[key]['mean'].to_numpy(), full[key]['mean'].to_numpy(),
+                                   rtol=1e-12, err_msg=key)
+        assert list(stream[key].index.astype(str)) == list(full[key].index.astype(str)), key
+    assert (stream['pivot'] - full['pivot']).abs().max().max() < 1e-12
@@ -0,0 +1,65 @@
+# The typed loader must give the same values as pd.read_csv's guessed types
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from titanic_data import PORTS, SEX, TITANIC_DTYPES, load_titanic, memory_mb, titanic_dtypes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN = os.path.join(ROOT, 'train.csv')
+TEST = os.path.join(ROOT, 'test.csv')
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return pd.read_csv(TRAIN), load_titanic(TRAIN)
+
+
+def test_dtypes(frames):
+    _, typed = frames
+    assert list(typed.columns) == list(TITANIC_DTYPES)
+    for column, dtype in TITANIC_DTYPES.items():
+        assert typed[column].dtype == dtype, column
+    assert typed['Sex'].dtype == SEX
+    assert typed['Embarked'].dtype == PORTS
+
+
+def test_only_the_columns_the_file_has():
+    dtypes = titanic_dtypes(TEST)
+    assert 'Survived' not in dtypes
+    typed = load_titanic(TEST)
+    assert typed['Pclass'].dtype == np.int8
+    assert typed['Fare'].isna().sum() == 1
+
+
+@pytest.mark.parametrize('column', ['PassengerId', 'Survived', 'Pclass', 'SibSp', 'Parch', 'Fare'])
+def test_numbers_unchanged(frames, column):
+    inferred, typed = frames
+    np.testing.assert_array_equal(typed[column].to_numpy(np.float64), inferred[column].to_numpy(np.float64))
+
+
+def test_age_fits_float32(frames):
+    inferred, typed = frames
+    np.testing.assert_array_equal(typed['Age'].to_numpy(), inferred['Age'].to_numpy(np.float32))
+    assert typed['Age'].isna().sum() == 177
+
+
+@pytest.mark.parametrize('column', ['Name', 'Sex', 'Ticket', 'Cabin', 'Embarked'])
+def test_text_unchanged(frames, column):
+    inferred, typed = frames
+    pd.testing.assert_series_equal(typed[column].astype(object), inferred[column].astype(object))
+
+
+def test_smaller(frames):
+    inferred, typed = frames
+    assert memory_mb(typed) < memory_mb(inferred)
+
+
+def test_grouped_means_unchanged(frames):
+    inferred, typed = frames
+    expected = inferred.groupby(['Pclass', 'Sex'])['Survived'].mean()
+    actual = typed.groupby(['Pclass', 'Sex'], observed=True)['Survived'].mean()
+    np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+    assert list(actual.index) == list(expected.index)
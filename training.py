@@ -0,0 +1,321 @@
+# Learned survival models, NumPy only
+# The rule models in scoring.py were tuned by hand. These two learn from the data:
+#   - LogisticRegression: Newton steps (iteratively reweighted least squares).
+#     With 8 features the Hessian is only 9x9, so each step is one pass over
+#     the rows plus a tiny linear solve, and it converges in ~6-8 steps.
+#   - HistogramTree: a decision tree (max_depth=1 is a decision stump). Every
+#     feature is cut into at most 32 bins once; a level of the tree is then one
+#     np.bincount per feature over (node, bin, survived) codes, instead of
+#     sorting the rows for every candidate split.
+#
+# Both train on the features_to_use matrix as one contiguous float32 array, or on
+# a function that yields (X, y) batches, e.g. chunks of a CSV too big for memory.
+# Each Newton step / tree level is one pass over the batches, so memory only
+# depends on the batch size.
+#
+# python training.py train.csv --holdout 0.3
+import argparse
+import time
+
+import numpy as np
+
+from preprocessing import FEATURES, Preprocessor
+from scoring import MODELS, predict_all
+from streaming import DEFAULT_CHUNKSIZE, read_chunks
+from titanic_data import load_titanic, titanic_dtypes
+
+BATCH_ROWS = 1 << 20
+BLOCK_ROWS = 1 << 14
+MAX_BINS = 32
+SAMPLE_ROWS = 1 << 20  # rows used to place the histogram bins
+# What Preprocessor.transform needs to make FEATURES, plus the target
+SOURCE_COLUMNS = ['Survived', 'Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked']
+
+
+def feature_matrix(df, features=FEATURES):
+    # Row-major float32: a row's features sit next to each other in memory
+    X = np.empty((len(df), len(features)), dtype=np.float32)
+    for index, column in enumerate(features):
+        X[:, index] = df[column].to_numpy()
+    return X
+
+
+def targets(df):
+    return df['Survived'].to_numpy().astype(np.int8)
+
+
+def array_batches(X, y, rows=BATCH_ROWS):
+    # A batches function over arrays already in memory (slices, no copies)
+    def batches():
+        for start in range(0, len(X), rows):
+            yield X[start:start + rows], y[start:start + rows]
+    return batches
+
+
+def csv_batches(path, preprocessor, chunksize=DEFAULT_CHUNKSIZE, features=FEATURES):
+    # A batches function that reads the CSV again on every pass (only the columns
+    # the features are made from, so Name / Ticket / Cabin are never parsed)
+    def batches():
+        for chunk in read_chunks(path, chunksize, usecols=SOURCE_COLUMNS, dtype=titanic_dtypes(path)):
+            chunk = preprocessor.transform(chunk)
+            yield feature_matrix(chunk, features), targets(chunk)
+    return batches
+
+
+def sigmoid(z):
+    with np.errstate(over='ignore'):
+        return 1 / (1 + np.exp(-z))
+
+
+class LogisticRegression:
+
+    def __init__(self, iterations=10, ridge=1e-4, tol=1e-6):
+        self.iterations = iterations
+        self.ridge = ridge  # a little L2 keeps the steps finite if a feature separates perfectly
+        self.tol = tol
+        self.weights = None
+        self.intercept = 0.0
+        self.steps = 0
+
+    def fit(self, X, y, batch_rows=BATCH_ROWS):
+        return self.fit_batches(array_batches(X, y, batch_rows))
+
+    def fit_batches(self, batches):
+        # batches() is called once per Newton step and yields (X, y)
+        self.weights = None
+        for self.steps in range(1, self.iterations + 1):
+            gradient = hessian = None
+            rows = 0
+            for X, y in batches():
+                if self.weights is None:
+                    self.weights = np.zeros(X.shape[1])
+                k = X.shape[1]
+                if gradient is None:
+                    gradient = np.zeros(k + 1)
+                    hessian = np.zeros((k + 1, k + 1))
+                # Small blocks keep the temporaries in the CPU cache (~3x faster than whole batches)
+                for start in range(0, len(X), BLOCK_ROWS):
+                    block = X[start:start + BLOCK_ROWS]
+                    p = sigmoid(self.decision(block))
+                    residual = p - y[start:start + BLOCK_ROWS]
+                    curvature = p * (1 - p)
+                    # Last row / column is the intercept
+                    gradient[:k] += block.T @ residual
+                    gradient[k] += residual.sum(dtype=np.float64)
+                    hessian[:k, :k] += block.T @ (block * curvature[:, None])
+                    hessian[:k, k] += curvature @ block
+                    hessian[k, k] += curvature.sum(dtype=np.float64)
+                rows += len(X)
+            if not rows:
+                raise ValueError('no training rows')
+            hessian[k, :k] = hessian[:k, k]
+            gradient /= rows
+            hessian /= rows
+            gradient[:k] += self.ridge * self.weights
+            hessian[:k, :k] += self.ridge * np.eye(k)
+            step = np.linalg.solve(hessian, gradient)
+            self.weights -= step[:k]
+            self.intercept -= step[k]
+            if np.abs(step).max() < self.tol:
+                break
+        return self
+
+    def decision(self, X):
+        return X @ self.weights.astype(np.float32) + np.float32(self.intercept)
+
+    def predict_proba(self, X):
+        return sigmoid(self.decision(X))
+
+    def predict(self, X):
+        return (self.decision(X) >= 0).astype(np.int64)
+
+
+def bin_edges(X, max_bins=MAX_BINS):
+    # Candidate split points per feature: quantiles, so every bin has rows in it
+    quantiles = np.linspace(0, 1, max_bins + 1)[1:-1]
+    return [np.unique(np.quantile(X[:, index], quantiles)).astype(np.float32)
+            for index in range(X.shape[1])]
+
+
+def bin_codes(X, edges):
+    # Bin of each value = how many edges are below it (a few compares beat a binary search)
+    # One contiguous row of codes per feature, so each histogram reads one block of memory
+    codes = np.zeros((X.shape[1], len(X)), dtype=np.uint8)
+    for index, feature_edges in enumerate(edges):
+        column = np.ascontiguousarray(X[:, index])
+        for edge in feature_edges:
+            codes[index] += column > edge
+    return codes
+
+
+class HistogramTree:
+
+    def __init__(self, max_depth=3, max_bins=MAX_BINS, min_leaf=20):
+        self.max_depth = max_depth
+        self.max_bins = max_bins
+        self.min_leaf = min_leaf
+        # Per level: the feature and threshold of every node (left = value <= threshold)
+        self.features = []
+        self.thresholds = []
+        self.edges = None
+        self.leaf_values = None
+
+    def fit(self, X, y, batch_rows=BATCH_ROWS):
+        # Bin the matrix once and reuse the codes for every level
+        self.edges = bin_edges(X[:SAMPLE_ROWS], self.max_bins)
+        codes = bin_codes(X, self.edges)
+
+        def batches():
+            for start in range(0, len(X), batch_rows):
+                stop = start + batch_rows
+                yield X[start:stop], codes[:, start:stop], y[start:stop]
+        return self.grow(batches)
+
+    def fit_batches(self, batches):
+        # batches() is called once per level and yields (X, y); bins come from the first batch
+        X, _ = next(iter(batches()))
+        self.edges = bin_edges(X[:SAMPLE_ROWS], self.max_bins)
+
+        def binned():
+            for X, y in batches():
+                yield X, bin_codes(X, self.edges), y
+        return self.grow(binned)
+
+    def grow(self, batches):
+        self.features = []
+        self.thresholds = []
+        n_bins = max(len(edges) for edges in self.edges) + 1
+        # (node, survived) counts for the nodes of the current level, filled by the first pass
+        node_counts = None
+        values = None
+        for depth in range(self.max_depth):
+            n_nodes = 1 << depth
+            histogram = np.zeros((len(self.edges), n_nodes, n_bins, 2), dtype=np.int64)
+            for X, codes, y in batches():
+                # key = (node, bin, survived) packed into one integer
+                base = self.node_ids(X, depth) * (n_bins * 2) + y
+                for index in range(len(self.edges)):
+                    keys = base + 2 * codes[index]
+                    histogram[index] += np.bincount(keys, minlength=n_nodes * n_bins * 2).reshape(
+                        n_nodes, n_bins, 2)
+            if node_counts is None:
+                node_counts = histogram[0].sum(axis=1)
+                values = self.node_values(node_counts, np.full(1, 0.5))
+            features, thresholds, node_counts = self.best_splits(histogram, node_counts)
+            self.features.append(features)
+            self.thresholds.append(thresholds)
+            values = self.node_values(node_counts, np.repeat(values, 2))
+        self.leaf_values = values
+        return self
+
+    def node_values(self, counts, parent_values):
+        # Survival rate per node; an empty node keeps its parent's
+        rows = counts.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(rows > 0, counts[:, 1] / rows, parent_values)
+
+    def best_splits(self, histogram, node_counts):
+        # Lowest weighted Gini impurity over every (feature, bin) split of every node
+        left = histogram.cumsum(axis=2)[:, :, :-1]  # feature, node, split bin, survived
+        right = node_counts[None, :, None, :] - left
+        impurity = gini(left) + gini(right)
+        too_small = ((left.sum(axis=3) < self.min_leaf) | (right.sum(axis=3) < self.min_leaf))
+        for index, edges in enumerate(self.edges):
+            too_small[index, :, len(edges):] = True
+        impurity = np.where(too_small, np.inf, impurity)
+
+        n_features, n_nodes, n_splits = impurity.shape
+        flat = impurity.transpose(1, 0, 2).reshape(n_nodes, -1)
+        best = flat.argmin(axis=1)
+        feature, split = np.divmod(best, n_splits)
+        nodes = np.arange(n_nodes)
+        improves = flat[nodes, best] < gini(node_counts) - 1e-9
+
+        thresholds = np.full(n_nodes, np.inf, dtype=np.float32)  # no split: every row goes left
+        child_counts = np.zeros((2 * n_nodes, 2), dtype=np.int64)
+        child_counts[0::2] = node_counts
+        for node in np.flatnonzero(improves):
+            thresholds[node] = self.edges[feature[node]][split[node]]
+            child_counts[2 * node] = left[feature[node], node, split[node]]
+            child_counts[2 * node + 1] = right[feature[node], node, split[node]]
+        return np.where(improves, feature, 0), thresholds, child_counts
+
+    def node_ids(self, X, depth):
+        # Which node of level `depth` each row reaches
+        nodes = np.zeros(len(X), dtype=np.intp)
+        for features, thresholds in zip(self.features[:depth], self.thresholds[:depth]):
+            values = X[np.arange(len(X)), features[nodes]]
+            nodes = 2 * nodes + ~(values <= thresholds[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        return self.leaf_values[self.node_ids(X, self.max_depth)]
+
+    def predict(self, X):
+        return (self.predict_proba(X) >= 0.5).astype(np.int64)
+
+    def rules(self, features=FEATURES):
+        # The splits as text, one line per node that splits
+        lines = []
+        for depth, (node_features, thresholds) in enumerate(zip(self.features, self.thresholds)):
+            for node, (feature, threshold) in enumerate(zip(node_features, thresholds)):
+                if np.isfinite(threshold):
+                    lines.append(f"{'  ' * depth}level {depth} node {node}: "
+                                 f"{features[feature]} <= {threshold:g}")
+        return lines
+
+
+def gini(counts):
+    # rows * Gini impurity = 2 * survived * died / rows, over the last axis (died, survived)
+    rows = counts.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(rows > 0, 2 * counts[..., 0] * counts[..., 1] / rows, 0.0)
+
+
+def accuracy(predictions, y):
+    return (predictions == y).mean() * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train learned survival models and compare with the rules')
+    parser.add_argument('path', nargs='?', default='train.csv')
+    parser.add_argument('--holdout', type=float, default=0.3, help='share of rows kept back for testing')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = load_titanic(args.path)
+    test = np.random.default_rng(args.seed).random(len(df)) < args.holdout
+    # Fills learned from the training rows only
+    preprocessor = Preprocessor().fit(df[~test])
+    df = preprocessor.transform(df)
+    X, y = feature_matrix(df), targets(df)
+    print(f"{(~test).sum()} training rows, {test.sum()} held out\n")
+
+    rules = predict_all(df)
+    results = [(MODELS[model]['name'], 0.0, rules[model].to_numpy()) for model in MODELS]
+    learners = [('Logistic regression', LogisticRegression()),
+                ('Decision stump', HistogramTree(max_depth=1)),
+                (f"Tree (depth {args.depth})", HistogramTree(max_depth=args.depth))]
+    for name, learner in learners:
+        start = time.perf_counter()
+        learner.fit(X[~test], y[~test])
+        results.append((name, time.perf_counter() - start, learner.predict(X)))
+
+    print(f"{'model':<22} {'fit ms':>8} {'train %':>8} {'holdout %':>9}")
+    for name, seconds, predictions in results:
+        print(f"{name:<22} {seconds * 1000:8.1f} {accuracy(predictions[~test], y[~test]):8.1f} "
+              f"{accuracy(predictions[test], y[test]):9.1f}")
+
+    logistic = learners[0][1]
+    print("\nLogistic regression weights:")
+    for feature, weight in zip(FEATURES, logistic.weights):
+        print(f"  {feature:<12} {weight:+.3f}")
+    print(f"  {'intercept':<12} {logistic.intercept:+.3f}")
+    print("\nTree splits:")
+    for line in learners[2][1].rules():
+        print(f"  {line}")
+
+
+if __name__ == '__main__':
+    main()
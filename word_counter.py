@@ -1,4 +1,19 @@
-sentence = input("Type your sentence")
+import argparse
+import heapq
+import mmap
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from sketches import CountMinSketch
+
+# Big files are counted in blocks of this many bytes
+BLOCK_SIZE = 16 * 1024 * 1024
+WHITESPACE = b' \t\n\r\x0b\x0c'
+
+
 def count_words(sentence):
     words=sentence.split()
     word_count={}
@@ -6,8 +21,148 @@ def count_words(sentence):
         word_count[word]=word_count.get(word,0)+1
     return word_count
 
-#call function and print result
-result = count_words(sentence)
-print(result)
+
+#file mode: split the file into blocks that end on whitespace, so no word is cut in two
+def block_bounds(path, block_size=BLOCK_SIZE):
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            stop = min(start + block_size, size)
+            # move the cut forward to the next whitespace byte
+            while stop < size and data[stop] not in WHITESPACE:
+                stop += 1
+            bounds.append((start, stop))
+            start = stop
+    return bounds
+
+
+def count_block(path, start, stop):
+    #only this block's words are ever in memory at once
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:stop].decode('utf-8', errors='replace')
+    return Counter(text.split())
+
+
+def count_words_in_file(path, workers=None, block_size=BLOCK_SIZE):
+    #same counts as count_words(open(path).read()), without reading the whole file at once
+    bounds = block_bounds(path, block_size)
+    total = Counter()
+    if workers == 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            total.update(count_block(path, start, stop))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(count_block, path, start, stop) for start, stop in bounds]
+        for job in jobs:
+            total.update(job.result())
+    return total
+
+
+def stream_blocks(stream, block_size=BLOCK_SIZE):
+    #for pipes / stdin: the words of each text block, a word cut at the block end goes to the next one
+    leftover = ''
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        text = leftover + block
+        words = text.split()
+        if words and not text[-1].isspace():
+            leftover = words.pop()
+        else:
+            leftover = ''
+        yield words
+    if leftover:
+        yield [leftover]
+
+
+def count_words_in_stream(stream, block_size=BLOCK_SIZE):
+    total = Counter()
+    for words in stream_blocks(stream, block_size):
+        total.update(words)
+    return total
+
+
+#approximate mode: fixed memory however many different words there are
+def approx_count_block(path, start, stop, epsilon, delta, top):
+    sketch = CountMinSketch(epsilon, delta, top)
+    return sketch.update_counts(count_block(path, start, stop))
+
+
+def approx_count_words_in_file(path, epsilon=0.0001, delta=0.01, top=100, workers=None,
+                               block_size=BLOCK_SIZE):
+    #returns a CountMinSketch: .estimate([...]) for any words, .heavy_hitters(k) for the top
+    bounds = block_bounds(path, block_size)
+    total = CountMinSketch(epsilon, delta, top)
+    if workers == 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            total.merge(approx_count_block(path, start, stop, epsilon, delta, top))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(approx_count_block, path, start, stop, epsilon, delta, top)
+                for start, stop in bounds]
+        for job in jobs:
+            total.merge(job.result())
+    return total
+
+
+def approx_count_words_in_stream(stream, epsilon=0.0001, delta=0.01, top=100, block_size=BLOCK_SIZE):
+    #same sketch from a pipe / stdin, one block's exact counts at a time
+    total = CountMinSketch(epsilon, delta, top)
+    for words in stream_blocks(stream, block_size):
+        total.update_counts(Counter(words))
+    return total
+
+
+def top_words(word_count, k=10):
+    #a heap keeps only the k biggest counts, no need to sort every word
+    return heapq.nlargest(k, word_count.items(), key=itemgetter(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count words in a sentence, a file or stdin')
+    parser.add_argument('path', nargs='?', help="file to count ('-' for stdin)")
+    parser.add_argument('--top', type=int, help='only print the k most common words')
+    parser.add_argument('--workers', type=int, help='processes for file mode')
+    parser.add_argument('--approx', action='store_true',
+                        help="fixed-size Count-Min sketch for a file or '-' (prints the --top words, default 10)")
+    parser.add_argument('--epsilon', type=float, default=0.0001,
+                        help='approx: counts are at most epsilon * total words too high')
+    args = parser.parse_args()
+
+    if args.approx:
+        if args.path is None:
+            parser.error("--approx needs a file path or '-' for stdin")
+        if args.path == '-':
+            sketch = approx_count_words_in_stream(sys.stdin, args.epsilon, top=args.top or 10)
+        else:
+            sketch = approx_count_words_in_file(args.path, args.epsilon, top=args.top or 10,
+                                                workers=args.workers)
+        for word, count in sketch.heavy_hitters(args.top or 10):
+            print(f"{word}: ~{count}")
+        return
+
+    if args.path is None:
+        sentence = input("Type your sentence")
+        #call function and print result
+        result = count_words(sentence)
+    elif args.path == '-':
+        result = count_words_in_stream(sys.stdin)
+    else:
+        result = count_words_in_file(args.path, args.workers)
+
+    if args.top:
+        for word, count in top_words(result, args.top):
+            print(f"{word}: {count}")
+    else:
+        print(dict(result))
     #for word, count in word_count.items():
         #print(f"{word}: {count}")
+
+
+if __name__ == '__main__':
+    main()